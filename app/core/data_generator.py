@@ -4,16 +4,87 @@ Uses WNTR to simulate normal and leak scenarios on any .inp network,
 producing PyTorch Geometric Data objects for GNN training.
 """
 
+import hashlib
+import math
 import os
 import random
+import shutil
+import tempfile
+import warnings
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
+import scipy.sparse as sp
 import torch
 from torch_geometric.data import Data
 
+import pandas as pd
 import wntr
+from wntr.epanet.toolkit import ENepanet
+from wntr.epanet.util import EN, FlowUnits, HydParam, from_si
+
+from ..disk_cache import CACHE_DIR
+
+# Bump when _compute_node_features changes numerically, so cached baselines
+# can't leave rounding-level residuals against freshly computed scenarios
+_BASELINE_CACHE_VERSION = 2
+
+_SQRT_2G = math.sqrt(2 * 9.81)
+
+# WaterNetworkModel -> (node_list, elevations); weak so models can still be freed
+_elevation_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+# WaterNetworkModel -> (node_list, degrees); topology never changes between scenarios
+_degree_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _baseline_cache_path(inp_path, duration_hours=48) -> Path:
+    """Cache file for a network's baseline, keyed on the .inp contents (not its name)."""
+    digest = hashlib.sha256(Path(inp_path).read_bytes()).hexdigest()
+    return CACHE_DIR / f"{digest}_{duration_hours}_v{_BASELINE_CACHE_VERSION}.npz"
+
+
+def _load_baseline_cache(cache_path):
+    """Return (baseline_features, node_list, junction_names, edge_index) or None on a miss."""
+    if not cache_path.exists():
+        return None
+    try:
+        with np.load(cache_path) as cached:
+            return (
+                cached['baseline_features'],
+                cached['node_list'].tolist(),
+                cached['junction_names'].tolist(),
+                torch.from_numpy(cached['edge_index']),
+            )
+    except Exception as e:
+        print(f"  ⚠ Ignoring unreadable baseline cache {cache_path.name}: {e}")
+        return None
+
+
+def _save_baseline_cache(cache_path, baseline_features, node_list, junction_names, edge_index):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            cache_path,
+            baseline_features=baseline_features,
+            node_list=np.array(node_list, dtype=str),
+            junction_names=np.array(junction_names, dtype=str),
+            edge_index=edge_index.numpy(),
+        )
+    except Exception as e:
+        print(f"  ⚠ Could not cache baseline ({e})")
+
+
+def _pipe_endpoints(wn, node_list):
+    """(start, end) positions in `node_list` of every pipe's end nodes; -1 where absent."""
+    pipes = [link for _, link in wn.pipes()]
+    index = pd.Index(node_list)
+    src = index.get_indexer([link.start_node_name for link in pipes]).astype(np.int64)
+    dst = index.get_indexer([link.end_node_name for link in pipes]).astype(np.int64)
+    return src, dst
 
 
 def _get_adjacency(wn):
@@ -21,33 +92,41 @@ def _get_adjacency(wn):
     node_list = wn.junction_name_list + wn.reservoir_name_list + wn.tank_name_list
     node_to_idx = {name: i for i, name in enumerate(node_list)}
 
-    edges = []
-    for link_name in wn.pipe_name_list:
-        link = wn.get_link(link_name)
-        i = node_to_idx.get(link.start_node_name)
-        j = node_to_idx.get(link.end_node_name)
-        if i is not None and j is not None:
-            edges.append([i, j])
-            edges.append([j, i])  # undirected
-
-    if not edges:
-        return torch.zeros((2, 0), dtype=torch.long), node_list, node_to_idx
+    src, dst = _pipe_endpoints(wn, node_list)
+    valid = (src >= 0) & (dst >= 0)
+    src, dst = src[valid], dst[valid]
 
-    edge_index = torch.tensor(edges, dtype=torch.long).t().contiguous()
+    # Interleave (i, j), (j, i) per pipe so the graph is undirected
+    edges = np.empty((2, 2 * len(src)), dtype=np.int64)
+    edges[0, 0::2] = edges[1, 1::2] = src
+    edges[1, 0::2] = edges[0, 1::2] = dst
+    edge_index = torch.from_numpy(edges)
     return edge_index, node_list, node_to_idx
 
 
-def _simulate_pressures(wn, duration_hours=48):
-    """Run a hydraulic simulation and return the mean pressure per junction."""
+def _configure_times(wn, duration_hours=48):
     wn.options.time.duration = duration_hours * 3600
     wn.options.time.hydraulic_timestep = 3600
     wn.options.time.report_timestep = 3600
 
+
+def _simulate_pressures(wn, duration_hours=48, wntr_fallback=True):
+    """
+    Run a hydraulic simulation and return the pressure per junction and report step.
+    If EPANET fails and `wntr_fallback` is set, retry with WNTR's pure-Python solver
+    (much slower); otherwise the EPANET error propagates.
+    """
+    _configure_times(wn, duration_hours)
+
     try:
-        sim = wntr.sim.EpanetSimulator(wn)
-        results = sim.run_sim()
+        # Private scratch dir so concurrent workers don't clobber each other's
+        # temp.inp/temp.bin files in the shared working directory
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sim = wntr.sim.EpanetSimulator(wn)
+            results = sim.run_sim(file_prefix=os.path.join(tmp_dir, 'temp'))
     except Exception:
-        # Fallback to WNTR's own solver if EPANET binary fails
+        if not wntr_fallback:
+            raise
         sim = wntr.sim.WNTRSimulator(wn)
         results = sim.run_sim()
 
@@ -55,157 +134,355 @@ def _simulate_pressures(wn, duration_hours=48):
     return pressures
 
 
+def _node_elevations(wn, node_list):
+    """Elevation per node in `node_list` order; cached per model since it never changes."""
+    cached = _elevation_cache.get(wn)
+    if cached is not None and cached[0] == node_list:
+        return cached[1]
+
+    # One pass over the node registry instead of a get_node lookup per name
+    by_name = {name: getattr(node, 'elevation', 0.0) for name, node in wn.nodes()}
+    elevations = np.array([by_name.get(name, 0.0) for name in node_list], dtype=np.float32)
+    _elevation_cache[wn] = (list(node_list), elevations)
+    return elevations
+
+
+def _node_degrees(wn, node_list):
+    """Number of pipes incident to each node; cached per model like the elevations."""
+    cached = _degree_cache.get(wn)
+    if cached is not None and cached[0] == node_list:
+        return cached[1]
+
+    endpoints = np.concatenate(_pipe_endpoints(wn, node_list))
+    endpoints = endpoints[endpoints >= 0]
+    degrees = np.bincount(endpoints, minlength=len(node_list)).astype(np.float32)
+    _degree_cache[wn] = (list(node_list), degrees)
+    return degrees
+
+
 def _compute_node_features(wn, pressures_df, node_list):
     """Compute per-node feature vectors: [mean_pressure, std_pressure, elevation, degree]."""
-    node_to_idx_map = {name: i for i, name in enumerate(node_list)}
-    n_nodes = len(node_list)
-    features = np.zeros((n_nodes, 4), dtype=np.float32)
-
-    # Degree (number of connected pipes)
-    degree = np.zeros(n_nodes, dtype=np.float32)
-    for link_name in wn.pipe_name_list:
-        link = wn.get_link(link_name)
-        i = node_to_idx_map.get(link.start_node_name)
-        j = node_to_idx_map.get(link.end_node_name)
-        if i is not None:
-            degree[i] += 1
-        if j is not None:
-            degree[j] += 1
-
-    for idx, name in enumerate(node_list):
-        if name in pressures_df.columns:
-            series = pressures_df[name].values
-            features[idx, 0] = np.nanmean(series)
-            features[idx, 1] = np.nanstd(series)
-        try:
-            node = wn.get_node(name)
-            features[idx, 2] = getattr(node, 'elevation', 0.0)
-        except Exception:
-            features[idx, 2] = 0.0
-        features[idx, 3] = degree[idx]
+    features = np.zeros((len(node_list), 4), dtype=np.float32)
+
+    # Column-wise NaN-skipping stats on the raw array, which skips the
+    # DataFrame reductions' per-call overhead; nodes without a pressure column stay 0
+    pressures = pressures_df.to_numpy()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns give NaN, as in pandas
+        mean = np.nanmean(pressures, axis=0)
+        std = np.nanstd(pressures, axis=0, dtype=np.float64)
+    # Place them by position instead of reindexing a Series per stat
+    pos = pressures_df.columns.get_indexer(node_list)
+    present = pos >= 0
+    features[present, 0] = mean[pos[present]]
+    features[present, 1] = std[pos[present]]
+    features[:, 2] = _node_elevations(wn, node_list)
+    features[:, 3] = _node_degrees(wn, node_list)
 
     return features
 
 
-def _get_zone_labels(wn, node_list, node_to_idx, leak_node_name, zone_radius=2):
+def _zone_reach_matrix(edge_index, n_nodes, zone_radius=2):
     """
-    Label nodes within `zone_radius` hops of the leak node as 1 (leak zone), else 0.
-    This creates the 'suspect area' rather than pinpointing a single pipe.
+    Boolean sparse matrix whose row i marks every node within `zone_radius`
+    hops of node i, i.e. the nonzero pattern of (A + I)^zone_radius.
+    Topology is fixed per network, so this is built once and shared by all scenarios.
     """
-    n_nodes = len(node_list)
-    labels = np.zeros(n_nodes, dtype=np.float32)
-
-    leak_idx = node_to_idx.get(leak_node_name)
-    if leak_idx is None:
-        return labels
-
-    # BFS to find all nodes within zone_radius hops
-    # Build adjacency list
-    adj = {i: set() for i in range(n_nodes)}
-    for link_name in wn.pipe_name_list:
-        link = wn.get_link(link_name)
-        i = node_to_idx.get(link.start_node_name)
-        j = node_to_idx.get(link.end_node_name)
-        if i is not None and j is not None:
-            adj[i].add(j)
-            adj[j].add(i)
-
-    visited = {leak_idx}
-    frontier = {leak_idx}
+    edges = np.asarray(edge_index)
+    adjacency = sp.csr_matrix(
+        (np.ones(edges.shape[1], dtype=bool), (edges[0], edges[1])),
+        shape=(n_nodes, n_nodes),
+    )
+    step = (adjacency + sp.eye(n_nodes, dtype=bool, format='csr')).astype(bool)
+    reach = sp.eye(n_nodes, dtype=bool, format='csr')
     for _ in range(zone_radius):
-        next_frontier = set()
-        for node in frontier:
-            for neighbor in adj[node]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    next_frontier.add(neighbor)
-        frontier = next_frontier
+        reach = (reach @ step).astype(bool)
+    return reach
 
-    for idx in visited:
-        labels[idx] = 1.0
 
+def _get_zone_labels(zone_reach, leak_indices):
+    """
+    Label nodes within the zone radius of each leak node as 1 (leak zone), else 0,
+    as one (S, N) array. This creates the 'suspect area' rather than pinpointing a
+    single pipe. Scenarios whose leak index is None get an all-zero row.
+    """
+    labels = np.zeros((len(leak_indices), zone_reach.shape[0]), dtype=np.float32)
+    rows = [i for i, leak_idx in enumerate(leak_indices) if leak_idx is not None]
+    if rows:
+        labels[rows] = zone_reach[[leak_indices[i] for i in rows]].toarray()
     return labels
 
 
+def _emitter_coefficient(leak_diameter):
+    """EPANET emitter coefficient (SI) of a circular orifice: Cd * area * sqrt(2g), Cd = 0.75."""
+    return 0.75 * (math.pi * (leak_diameter / 2) ** 2) * _SQRT_2G
+
+
+def _default_workers() -> int:
+    """Leave a third of the cores free for the parent process and EPANET I/O."""
+    return max(1, (os.cpu_count() or 1) * 2 // 3)
+
+
+class _EpanetScenarioRunner:
+    """
+    Keeps one EPANET project open for a network so that each leak scenario only
+    toggles a node emitter and re-solves hydraulics, instead of re-parsing the
+    .inp into a new WaterNetworkModel and writing it back out for EpanetSimulator.
+    The project is written in LPS so EPANET reports pressures in metres, matching
+    the SI results the baseline gets from EpanetSimulator.
+    """
+
+    _units = FlowUnits.LPS
+
+    def __init__(self, inp_path, node_list, duration_hours=48):
+        self.wn = wntr.network.WaterNetworkModel(inp_path)
+        _configure_times(self.wn, duration_hours)
+        self.node_list = node_list
+        self.report_step = self.wn.options.time.report_timestep
+
+        self._tmp_dir = tempfile.mkdtemp(prefix='aquaguard_en_')
+        prefix = os.path.join(self._tmp_dir, 'scenario')
+        wntr.network.write_inpfile(self.wn, prefix + '.inp', units=self._units.name)
+
+        self.en = ENepanet()
+        self.en.ENopen(prefix + '.inp', prefix + '.rpt', prefix + '.bin')
+        self.node_indices = [self.en.ENgetnodeindex(name) for name in node_list]
+
+    def pressures(self, leak_node=None, emitter_coefficient=0.0):
+        """Pressures (T, N) with an extra emitter (SI units) at `leak_node`, if given."""
+        if leak_node is None:
+            return self._solve()
+        idx = self.en.ENgetnodeindex(leak_node)
+        original = self.en.ENgetnodevalue(idx, EN.EMITTER)
+        coeff = from_si(self._units, emitter_coefficient, HydParam.EmitterCoeff)
+        self.en.ENsetnodevalue(idx, EN.EMITTER, original + coeff)
+        try:
+            return self._solve()
+        finally:
+            self.en.ENsetnodevalue(idx, EN.EMITTER, original)
+
+    def _solve(self):
+        # Re-open the hydraulic solver every run: ENinitH alone leaves control
+        # state from the previous run behind and gives different pressures
+        rows = []
+        self.en.ENopenH()
+        try:
+            self.en.ENinitH(0)
+            while True:
+                t = self.en.ENrunH()
+                if t % self.report_step == 0:
+                    rows.append([self.en.ENgetnodevalue(i, EN.PRESSURE) for i in self.node_indices])
+                if self.en.ENnextH() <= 0:
+                    break
+        finally:
+            self.en.ENcloseH()
+        return pd.DataFrame(np.asarray(rows), columns=self.node_list)
+
+    def close(self):
+        try:
+            self.en.ENclose()
+        finally:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+# Per-process scenario state, set up once by _init_scenario_worker
+_runner: Optional[_EpanetScenarioRunner] = None
+_runner_finalizer: Optional[Finalize] = None
+_worker_config: dict = {}
+
+
+def _init_scenario_worker(inp_path, node_list, baseline_features, wntr_fallback):
+    global _runner, _runner_finalizer, _worker_config
+    _worker_config = {
+        'inp_path': inp_path,
+        'node_list': node_list,
+        'baseline_features': baseline_features,
+        'wntr_fallback': wntr_fallback,
+        'fallback_wn': None,  # parsed lazily, only if the toolkit path fails
+    }
+    try:
+        _runner = _EpanetScenarioRunner(inp_path, node_list)
+        # Pool workers exit without running atexit hooks; Finalize still fires.
+        # The handle is kept so an in-process close runs it (once) and deregisters it.
+        _runner_finalizer = Finalize(_runner, _runner.close, exitpriority=10)
+    except Exception:
+        _runner = None
+        _runner_finalizer = None
+
+
+def _close_scenario_worker():
+    global _runner, _runner_finalizer
+    if _runner_finalizer is not None:
+        _runner_finalizer()
+        _runner_finalizer = None
+    _runner = None
+
+
+def _simulate_one_scenario(leak_node, leak_diameter):
+    """
+    Simulate a single leak scenario and return the standardized node feature
+    matrix as a float16 NumPy array, or None if the simulation fails. Runs inside
+    worker processes, so it only takes and returns picklable, tensor-free values.
+    """
+    node_list = _worker_config['node_list']
+    baseline_features = _worker_config['baseline_features']
+
+    # Add an emitter to simulate a leak (leak coefficient)
+    leak_coeff = _emitter_coefficient(leak_diameter)
+
+    try:
+        if _runner is None:
+            raise RuntimeError("EPANET toolkit unavailable")
+        leak_pressures = _runner.pressures(leak_node, leak_coeff)
+        wn_leak = _runner.wn
+    except Exception:
+        if not _worker_config['wntr_fallback']:
+            # Some leak configurations may fail — skip them
+            return None
+        try:
+            # Slow path: EpanetSimulator, then WNTRSimulator, on one model per
+            # worker that is reset between scenarios instead of reparsed
+            wn_leak = _worker_config['fallback_wn']
+            if wn_leak is None:
+                wn_leak = wntr.network.WaterNetworkModel(_worker_config['inp_path'])
+                _worker_config['fallback_wn'] = wn_leak
+            else:
+                wn_leak.reset_initial_values()
+            node = wn_leak.get_node(leak_node)
+            original_coeff = node.emitter_coefficient
+            node.emitter_coefficient = leak_coeff
+            try:
+                leak_pressures = _simulate_pressures(wn_leak)
+            finally:
+                node.emitter_coefficient = original_coeff
+        except Exception:
+            return None
+
+    leak_features = _compute_node_features(wn_leak, leak_pressures, node_list)
+
+    # Compute residuals (how much pressure changed vs baseline)
+    residuals = leak_features - baseline_features
+    # Combine: [baseline_feat(4) + residual(4)] = 8 features per node
+    combined = np.concatenate([baseline_features, residuals], axis=1)
+    combined = np.nan_to_num(combined, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Per-graph feature standardization to prevent exploding gradients
+    mu = combined.mean(axis=0, keepdims=True)
+    sigma = combined.std(axis=0, keepdims=True) + 1e-6
+    # Cast to the stored precision here so only half the bytes cross the
+    # process boundary and the parent can wrap the array without a copy
+    return ((combined - mu) / sigma).astype(np.float16)
+
+
 def generate_dataset_for_network(
     inp_path: str,
     n_leak_scenarios: int = 50,
     zone_radius: int = 2,
     seed: int = 42,
+    n_workers: Optional[int] = None,
+    wntr_fallback: bool = True,
 ) -> list[Data]:
     """
     Generate a dataset of PyG Data objects for a single .inp network.
     Each Data object represents one leak scenario with zone labels.
+
+    Leak scenarios are independent EPANET runs and are simulated in a process
+    pool of `n_workers` (defaults to two thirds of the CPU count). Pass
+    `n_workers=1` to simulate sequentially in the current process. Each worker
+    keeps one EPANET project open and only toggles the leak emitter between
+    scenarios. Scenarios EPANET cannot solve are retried with WNTR's Python
+    solver when `wntr_fallback` is set, and skipped otherwise.
     """
     rng = random.Random(seed)
-    wn_base = wntr.network.WaterNetworkModel(inp_path)
-    edge_index, node_list, node_to_idx = _get_adjacency(wn_base)
-
-    if len(node_list) < 3:
-        return []
 
-    # Step 1: Simulate baseline (no leaks)
-    wn_baseline = wntr.network.WaterNetworkModel(inp_path)
-    try:
-        baseline_pressures = _simulate_pressures(wn_baseline)
-    except Exception as e:
-        print(f"  ⚠ Baseline simulation failed for {inp_path}: {e}")
-        return []
+    # Step 1: Simulate baseline (no leaks), reusing a previous run's result
+    # when this exact .inp has been seen before
+    cache_path = _baseline_cache_path(inp_path)
+    cached = _load_baseline_cache(cache_path)
+    if cached is not None:
+        baseline_features, node_list, junction_names, edge_index = cached
+        node_to_idx = {name: i for i, name in enumerate(node_list)}
+        if len(node_list) < 3:
+            return []
+    else:
+        wn_base = wntr.network.WaterNetworkModel(inp_path)
+        edge_index, node_list, node_to_idx = _get_adjacency(wn_base)
+
+        if len(node_list) < 3:
+            return []
+
+        # Solve the baseline with the same toolkit path the scenarios use, so
+        # residuals at unaffected nodes are exactly zero rather than I/O noise
+        try:
+            runner = _EpanetScenarioRunner(inp_path, node_list)
+            try:
+                baseline_pressures = runner.pressures()
+            finally:
+                runner.close()
+        except Exception:
+            wn_baseline = wntr.network.WaterNetworkModel(inp_path)
+            try:
+                baseline_pressures = _simulate_pressures(wn_baseline, wntr_fallback=wntr_fallback)
+            except Exception as e:
+                print(f"  ⚠ Baseline simulation failed for {inp_path}: {e}")
+                return []
 
-    baseline_features = _compute_node_features(wn_base, baseline_pressures, node_list)
+        baseline_features = _compute_node_features(wn_base, baseline_pressures, node_list)
+        junction_names = wn_base.junction_name_list
+        _save_baseline_cache(cache_path, baseline_features, node_list, junction_names, edge_index)
 
     # Step 2: Generate leak scenarios
-    junction_names = wn_base.junction_name_list
     if not junction_names:
         return []
 
-    # Sample leak locations (with replacement if needed)
+    # Sample leak locations (with replacement if needed) and hole sizes up
+    # front so results don't depend on worker scheduling
     leak_nodes = [rng.choice(junction_names) for _ in range(n_leak_scenarios)]
-    dataset = []
-
-    for i, leak_node in enumerate(leak_nodes):
+    leak_diameters = [rng.uniform(0.01, 0.05) for _ in range(n_leak_scenarios)]  # meters
+
+    n_workers = n_workers or _default_workers()
+    n_scenarios = len(leak_nodes)
+    worker_args = (inp_path, node_list, baseline_features, wntr_fallback)
+
+    if n_workers > 1 and n_scenarios > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, n_scenarios),
+            initializer=_init_scenario_worker,
+            initargs=worker_args,
+        ) as executor:
+            outcomes = list(executor.map(_simulate_one_scenario, leak_nodes, leak_diameters))
+    else:
+        _init_scenario_worker(*worker_args)
         try:
-            # Create a fresh network and inject a leak
-            wn_leak = wntr.network.WaterNetworkModel(inp_path)
-            node = wn_leak.get_node(leak_node)
-
-            # Add an emitter to simulate a leak (leak coefficient)
-            leak_diameter = rng.uniform(0.01, 0.05)  # meters
-            leak_area = np.pi * (leak_diameter / 2) ** 2
-            leak_coeff = 0.75 * leak_area * np.sqrt(2 * 9.81)
-            node.emitter_coefficient = leak_coeff
-
-            # Simulate with the leak
-            leak_pressures = _simulate_pressures(wn_leak)
-            leak_features = _compute_node_features(wn_base, leak_pressures, node_list)
-
-            # Compute residuals (how much pressure changed vs baseline)
-            residuals = leak_features - baseline_features
-            # Combine: [baseline_feat(4) + residual(4)] = 8 features per node
-            combined = np.concatenate([baseline_features, residuals], axis=1)
-            combined = np.nan_to_num(combined, nan=0.0, posinf=0.0, neginf=0.0)
-
-            # Per-graph feature standardization to prevent exploding gradients
-            mu = combined.mean(axis=0, keepdims=True)
-            sigma = combined.std(axis=0, keepdims=True) + 1e-6
-            combined = (combined - mu) / sigma
-
-            # Zone labels
-            labels = _get_zone_labels(wn_base, node_list, node_to_idx, leak_node, zone_radius)
-
-            data = Data(
-                x=torch.tensor(combined, dtype=torch.float),
-                edge_index=edge_index,
-                y=torch.tensor(labels, dtype=torch.float),
-                num_nodes=len(node_list),
-            )
-            dataset.append(data)
-
-        except Exception as e:
-            # Some leak configurations may fail — skip them
-            continue
+            outcomes = list(map(_simulate_one_scenario, leak_nodes, leak_diameters))
+        finally:
+            _close_scenario_worker()
+
+    zone_reach = _zone_reach_matrix(edge_index.numpy(), len(node_list), zone_radius)
+
+    # Compact storage: features are standardized per graph, so half precision
+    # is enough; AnomalyLeakDetector casts both back on input.
+    if len(node_list) < 2 ** 31:
+        edge_index = edge_index.to(torch.int32)
+
+    # Features and labels of all solved scenarios live in two stacked arrays;
+    # each Data gets row views of them (from_numpy shares the buffers, no copy),
+    # so the dataset is two allocations rather than two per scenario
+    solved = [i for i, combined in enumerate(outcomes) if combined is not None]
+    if not solved:
+        return []
+    features = np.stack([outcomes[i] for i in solved])
+    labels = _get_zone_labels(zone_reach, [node_to_idx.get(leak_nodes[i]) for i in solved])
 
-    return dataset
+    return [
+        Data(
+            x=torch.from_numpy(features[k]),
+            edge_index=edge_index,
+            y=torch.from_numpy(labels[k]),
+            num_nodes=len(node_list),
+        )
+        for k in range(len(solved))
+    ]
 
 
 def generate_full_dataset(
@@ -213,6 +490,7 @@ def generate_full_dataset(
     n_scenarios_per_network: int = 30,
     zone_radius: int = 2,
     save_path: Optional[str] = "data/models/training_data.pt",
+    n_workers: Optional[int] = None,
 ) -> list[Data]:
     """
     Generate training data across all .inp files in a directory.
@@ -229,6 +507,7 @@ def generate_full_dataset(
                 str(inp_file),
                 n_leak_scenarios=n_scenarios_per_network,
                 zone_radius=zone_radius,
+                n_workers=n_workers,
             )
             print(f"     ✅ Generated {len(data)} scenarios")
             all_data.extend(data)
@@ -239,7 +518,9 @@ def generate_full_dataset(
 
     if save_path:
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        torch.save(all_data, save_path)
+        # Tensor bytes go to their own zip records either way; protocol 5 makes
+        # the pickled Data wrappers around them much cheaper to load
+        torch.save(all_data, save_path, pickle_protocol=5)
         print(f"💾 Saved to {save_path}")
 
     return all_data
@@ -1,29 +1,49 @@
+import hashlib
 import os
 import warnings
+import weakref
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
-import einops
 import numpy as np
 import pandas as pd
 import torch
 import torch.nn.functional as F
 import wntr
-from scipy.fft import fft
-from scipy.spatial.distance import euclidean
-from scipy.stats import entropy
-from sklearn.ensemble import RandomForestRegressor
+from joblib import Parallel, delayed
+from numba import njit
+from scipy.fft import rfft
+from scipy.spatial.distance import cdist
+from scipy.special import entr
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
 from torch_geometric.data import Data
-from torch_geometric.loader import DataLoader
 from torch_geometric.nn import GATv2Conv
 import pickle
 import copy
 
 from tqdm import tqdm
+from ..disk_cache import file_cache_path
 from .models import AnomalyLeakDetector
 
 warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
 
+_MODELS_DIR = Path(__file__).resolve().parents[2] / 'data' / 'models'
+
+# AnomalyLeakDetector / optimizer settings used by train_gnn (part of the cache key)
+_GNN_HPARAMS = {
+    'hid_dim': 32, 'num_layers': 4, 'lstm_layers': 1,
+    'lr': 0.01, 'weight_decay': 1e-4, 'batch_size': 256,
+    'epochs': 30, 'patience': 5,
+}
+
+# bf16 autocast + torch.compile are on by default for CUDA. On CPU they are opt-in:
+# the LSTM front end dominates there, and measured no faster in bf16 or compiled
+# (with ~50s of compile time), so only enable it on hardware where it pays off.
+_GNN_CPU_ACCEL = os.getenv("AQUAGUARD_GNN_CPU_ACCEL") == "1"
+
 def permutation_entropy_1d(series, m=3, tau=1):
     if isinstance(series, pd.Series):
         series = series.values
@@ -31,26 +51,243 @@ def permutation_entropy_1d(series, m=3, tau=1):
     if n <= (m - 1) * tau:
         return 0.0
 
-    permutations = []
-    for i in range(n - (m - 1) * tau):
-        vec = series[i:i + m * tau:tau]
-        permutation = np.argsort(vec)
-        permutations.append(tuple(permutation))
-
-    unique_perms, counts = np.unique(permutations, axis=0, return_counts=True)
-    probs = counts / len(permutations)
-    return entropy(probs, base=2)
+    # All embedding vectors at once: (n - (m-1)*tau, m)
+    windows = np.lib.stride_tricks.sliding_window_view(series, (m - 1) * tau + 1)[:, ::tau]
+    permutations = np.argsort(windows, axis=1, kind='stable')
+
+    # Encode each ordinal pattern as a base-m integer and histogram the codes
+    codes = permutations @ (m ** np.arange(m - 1, -1, -1))
+    if m <= 4:
+        # Dense histogram over at most m**m = 256 codes
+        counts = np.bincount(codes)
+        counts = counts[counts > 0]
+    else:
+        # m**m grows too fast for bincount; only the observed patterns matter
+        _, counts = np.unique(codes, return_counts=True)
+    probs = counts / len(codes)
+    return -np.sum(probs * np.log2(probs))
 
 def fourier_entropy_1d(series):
     if isinstance(series, pd.Series):
         series = series.values
-    fft_coeffs = fft(series)
-    power_spectrum = np.abs(fft_coeffs) ** 2
-    ps_sum = np.sum(power_spectrum)
+    # Real input: the rfft half-spectrum carries the same information, with
+    # every bin except DC (and Nyquist for even lengths) mirrored once.
+    fft_coeffs = rfft(np.asarray(series, dtype=np.float64))
+    power_spectrum = fft_coeffs.real ** 2 + fft_coeffs.imag ** 2
+    # Bins counted once in the full spectrum: DC, plus Nyquist for even lengths
+    unmirrored = [0, -1] if len(series) % 2 == 0 and len(power_spectrum) > 1 else [0]
+    ps_sum = 2 * power_spectrum.sum() - power_spectrum[unmirrored].sum()
     if ps_sum == 0:
         return 0.0
-    normalized_spectrum = power_spectrum / ps_sum
-    return entropy(normalized_spectrum, base=2)
+    h = entr(np.divide(power_spectrum, ps_sum, out=power_spectrum))
+    return (2 * h.sum() - h[unmirrored].sum()) / np.log(2)
+
+@njit(cache=True)
+def _combined_entropy_kernel(re, im, series, m, stride):
+    """
+    Fourier entropy of `series` (from its rfft re/im parts) times permutation
+    entropy of series[::stride] + 1e-3, with NaN components scored as 0.
+    Matches fourier_entropy_1d / permutation_entropy_1d (stable ordinal ranks,
+    NaN ranked last like np.argsort).
+    """
+    n = len(series)
+    n_bins = len(re)
+    ps_sum = 0.0
+    for k in range(n_bins):
+        w = 1.0 if k == 0 or (k == n_bins - 1 and n % 2 == 0) else 2.0
+        ps_sum += w * (re[k] * re[k] + im[k] * im[k])
+    f_ent = 0.0
+    if ps_sum != 0.0:
+        for k in range(n_bins):
+            p = (re[k] * re[k] + im[k] * im[k]) / ps_sum
+            if p > 0.0:
+                w = 1.0 if k == 0 or (k == n_bins - 1 and n % 2 == 0) else 2.0
+                f_ent -= w * p * np.log2(p)
+        if np.isnan(ps_sum):
+            f_ent = 0.0
+
+    x = series[::stride]
+    n_windows = len(x) - m + 1
+    p_ent = 0.0
+    if n_windows > 0:
+        counts = np.zeros(m ** m, dtype=np.int64)
+        order = np.empty(m, dtype=np.int64)
+        for t in range(n_windows):
+            # Stable insertion sort of window indices
+            for a in range(m):
+                b = a
+                v = x[t + a]
+                while b > 0:
+                    u = x[t + order[b - 1]]
+                    if np.isnan(v) or (not np.isnan(u) and u <= v):
+                        break
+                    order[b] = order[b - 1]
+                    b -= 1
+                order[b] = a
+            code = 0
+            for a in range(m):
+                code = code * m + order[a]
+            counts[code] += 1
+        for c in counts:
+            if c > 0:
+                p = c / n_windows
+                p_ent -= p * np.log2(p)
+
+    return f_ent * (p_ent + 1e-3)
+
+def combined_entropy_1d(series, m=3, stride=3):
+    """fourier_entropy_1d(series) * (permutation_entropy_1d(series[::stride], m) + 1e-3)."""
+    if isinstance(series, pd.Series):
+        series = series.values
+    series = np.ascontiguousarray(series, dtype=np.float64)
+    fft_coeffs = rfft(series)
+    return _combined_entropy_kernel(fft_coeffs.real, fft_coeffs.imag, series, m, stride)
+
+@njit(cache=True)
+def _cusum_scan(x, mean, K):
+    """
+    Positive CUSUM per column: c[t] = max(0, x[t] - mean + c[t-1] - K), c[0] = 0.
+    Serial on purpose: it runs on the pipeline worker thread, and numba's parallel
+    threading layers either hang interpreter exit or abort on concurrent launches.
+    """
+    T, N = x.shape
+    out = np.zeros_like(x)
+    for j in range(N):
+        acc = 0.0
+        for t in range(1, T):
+            v = x[t, j] - mean[j] + acc - K[j]
+            # Same NaN propagation as np.maximum(0, v)
+            acc = v if (v > 0.0 or np.isnan(v)) else 0.0
+            out[t, j] = acc
+    return out
+
+def _regression_features(p_ref, v):
+    """
+    leak_analysis design matrix [reference pressure, source flow, flow-to-pressure ratio].
+    p_ref (..., T) and v (T,) broadcast to (..., T, 3), so every reference node's
+    features come out of one call.
+    """
+    p_ref, v = np.broadcast_arrays(p_ref, v)
+    # ENGINEERED FEATURE: Flow-to-Pressure ratio (Demand vs Leak differentiator)
+    # Adds non-linearity. A hydrant open event shows a massive localized drop relative to systemic flow.
+    # Adding 1e-6 to avoid division by zero.
+    return np.stack([p_ref, v, v / (p_ref + 1e-6)], axis=-1)
+
+@lru_cache(maxsize=8)
+def _parse_network(inp_path, mtime):
+    return wntr.network.WaterNetworkModel(inp_path)
+
+def load_water_network(inp_path):
+    """
+    Parsed WaterNetworkModel for `inp_path`, shared between callers until the file
+    changes on disk. Treat it as read-only; deepcopy before mutating.
+    """
+    inp_path = str(inp_path)
+    return _parse_network(inp_path, os.path.getmtime(inp_path))
+
+# WaterNetworkModel -> (node name -> row, node coordinates (N, 2)); weak so models can be freed
+_node_xy_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def node_coordinates(network):
+    """Every node's (x, y) as one (N, 2) array plus a name -> row map, read in one pass. Cached per model."""
+    cached = _node_xy_cache.get(network)
+    if cached is None:
+        names = []
+        xy = []
+        for name, node in network.nodes():
+            names.append(name)
+            xy.append(node.coordinates)
+        cached = ({name: i for i, name in enumerate(names)}, np.array(xy, dtype=float).reshape(-1, 2))
+        _node_xy_cache[network] = cached
+    return cached
+
+# WaterNetworkModel -> (link name -> row, end node rows (L, 2)); weak so models can be freed
+_link_ends_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def link_endpoints(network):
+    """Every link's start/end node as rows into node_coordinates(network), plus a name -> row map. Cached per model."""
+    cached = _link_ends_cache.get(network)
+    if cached is None:
+        node_row = node_coordinates(network)[0]
+        names = []
+        ends = []
+        for name, link in network.links():
+            names.append(name)
+            ends.append((node_row[link.start_node_name], node_row[link.end_node_name]))
+        cached = ({name: i for i, name in enumerate(names)}, np.array(ends, dtype=np.intp).reshape(-1, 2))
+        _link_ends_cache[network] = cached
+    return cached
+
+# WaterNetworkModel -> (link names, segment starts, segment vectors); weak so models can be freed
+_link_segments_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _link_segments(network):
+    """Every link as a 2-D segment: (names, start points (L, 2), end - start (L, 2)). Cached per model."""
+    cached = _link_segments_cache.get(network)
+    if cached is None:
+        # Gathered from the shared node array rather than re-reading each end node
+        node_xy = node_coordinates(network)[1]
+        link_row, link_ends = link_endpoints(network)
+        start = node_xy[link_ends[:, 0]]
+        cached = (list(link_row), start, node_xy[link_ends[:, 1]] - start)
+        _link_segments_cache[network] = cached
+    return cached
+
+def snap_to_nearest_link(point, network):
+    """
+    Project `point` onto the closest link segment of `network`.
+    Returns (projected point, link name), or (point, None) for a network without links.
+    """
+    names, a, ab = _link_segments(network)
+    p = np.asarray(point, dtype=float)
+    if not names:
+        return p, None
+    dot = np.einsum("ij,ij->i", ab, ab)
+    # Zero-length links project onto their start node
+    t = np.clip(np.einsum("ij,ij->i", p - a, ab) / np.where(dot == 0, 1.0, dot), 0.0, 1.0)
+    proj = a + t[:, None] * ab
+    # Squared distances rank the same; no sqrt needed
+    d = p - proj
+    best = int(np.argmin(np.einsum("ij,ij->i", d, d)))
+    return proj[best], names[best]
+
+@lru_cache(maxsize=8)
+def _read_edge_index(edge_path, mtime):
+    """Undirected (edge_index, edge_attr) from an edge_index.csv, parsed once per file version."""
+    edges_df = pd.read_csv(edge_path)
+    # Node mapping: usually CSV has nodes 1-32. We need 0-31.
+    node1 = edges_df['Node1'].values - 1
+    node2 = edges_df['Node2'].values - 1
+    
+    edges = np.vstack([node1, node2])
+    edges_reversed = np.vstack([node2, node1])
+    edge_index = np.hstack([edges, edges_reversed])
+    
+    # Extract edge features: Length, Diameter, Roughness
+    # Assuming the CSV has these columns. If not, we fall back to None.
+    if 'Length' in edges_df.columns and 'Diameter' in edges_df.columns and 'Roughness' in edges_df.columns:
+        feats = edges_df[['Length', 'Diameter', 'Roughness']].values
+        # Scale features
+        scaler = StandardScaler()
+        feats_scaled = scaler.fit_transform(feats)
+        
+        # Duplicate for reversed edges
+        edge_attr = np.vstack([feats_scaled, feats_scaled])
+        return torch.as_tensor(edge_index, dtype=torch.long), torch.tensor(edge_attr, dtype=torch.float32)
+    else:
+        return torch.as_tensor(edge_index, dtype=torch.long), None
+
+def _fit_reference_model(X, y):
+    """
+    Fit one leak_analysis regressor. OpenMP is pinned to one thread: the models
+    are fitted in parallel processes, and on 3 features the histogram builder
+    barely scales across threads anyway.
+    """
+    # Histogram-binned boosting: far cheaper to fit than a 100-tree forest
+    # on 3 features, and predicts over the full T in native code
+    with threadpool_limits(limits=1, user_api='openmp'):
+        model = HistGradientBoostingRegressor(max_iter=100, max_depth=5, learning_rate=0.1, random_state=42)
+        return model.fit(X, y)
 
 class LeakDetector:
     def __init__(self, pressures, flows, delta=4, C_thr=3, est_length='3 days'):
@@ -62,12 +299,21 @@ class LeakDetector:
         self.C_thr = C_thr
         self.est_length = pd.Timedelta(est_length)
         self.nodes = pressures.columns.tolist()
+        self.node_to_idx = {n: i for i, n in enumerate(self.nodes)}
         
         # GNN Configuration
         self.gnn_model = None
-        self.gnn_scaler = None
+        self.gnn_mean = None
+        self.gnn_std = None
         self.edge_index = None
         self.edge_attr = None
+        self._gnn_errors_cache = {}
+        self._gnn_errors_source = None
+        self._tiled_graphs = {}
+
+        # Dense form of the last fault matrix passed to localize_physics_based
+        self._fault_arrays = None
+        self._fault_source = None
         
         # Device detection
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
@@ -78,29 +324,7 @@ class LeakDetector:
         edge_path = str(Path(__file__).resolve().parents[2] / 'data' / 'edge_index.csv')
         if not os.path.exists(edge_path):
             return None
-            
-        edges_df = pd.read_csv(edge_path)
-        # Node mapping: usually CSV has nodes 1-32. We need 0-31.
-        node1 = edges_df['Node1'].values - 1
-        node2 = edges_df['Node2'].values - 1
-        
-        edges = np.vstack([node1, node2])
-        edges_reversed = np.vstack([node2, node1])
-        edge_index = np.hstack([edges, edges_reversed])
-        
-        # Extract edge features: Length, Diameter, Roughness
-        # Assuming the CSV has these columns. If not, we fall back to None.
-        if 'Length' in edges_df.columns and 'Diameter' in edges_df.columns and 'Roughness' in edges_df.columns:
-            feats = edges_df[['Length', 'Diameter', 'Roughness']].values
-            # Scale features
-            scaler = StandardScaler()
-            feats_scaled = scaler.fit_transform(feats)
-            
-            # Duplicate for reversed edges
-            edge_attr = np.vstack([feats_scaled, feats_scaled])
-            return torch.tensor(edge_index, dtype=torch.long), torch.tensor(edge_attr, dtype=torch.float32)
-        else:
-            return torch.tensor(edge_index, dtype=torch.long), None
+        return _read_edge_index(edge_path, os.path.getmtime(edge_path))
 
     def _extract_gnn_features(self, df):
         # Extract raw sequences for the LSTM layer
@@ -118,8 +342,58 @@ class LeakDetector:
         # LSTM needs sequence length, so we keep window_size
         return windows
         
-    def train_gnn(self, cor_time_frame):
-        print("Training GNN AnomalyLeakDetector on calibration period...")
+    def _gnn_amp_dtype(self):
+        """Autocast dtype for GNN forward passes, or None to run in float32."""
+        if self.device.type == 'cuda':
+            return torch.bfloat16 if torch.cuda.is_bf16_supported() else None
+        return torch.bfloat16 if _GNN_CPU_ACCEL else None
+
+    def _tiled_graph(self, batch_size, num_nodes, device):
+        """
+        Block-diagonal edge_index/edge_attr for `batch_size` copies of the sensor
+        graph, built once per (batch size, device) and reused across epochs and calls.
+        """
+        key = (batch_size, num_nodes, str(device))
+        if key not in self._tiled_graphs:
+            edge_index = self.edge_index.to(device)
+            offsets = torch.arange(batch_size, device=device).repeat_interleave(edge_index.shape[1]) * num_nodes
+            self._tiled_graphs[key] = (
+                edge_index.repeat(1, batch_size) + offsets,
+                self.edge_attr.to(device).repeat(batch_size, 1) if self.edge_attr is not None else None,
+            )
+        return self._tiled_graphs[key]
+
+    def _graph_batches(self, features, batch_size, shuffle=False):
+        """
+        Yield PyG batches of (N, F) windows over the static sensor graph.
+
+        Same batches a DataLoader over one Data per window would produce, but
+        windows are sliced straight from `features` (W, N, F) and paired with
+        the cached tiled edge_index/edge_attr instead of being collated and
+        re-offset on every step.
+        """
+        num_windows, num_nodes, num_feats = features.shape
+        device = features.device
+        order = torch.randperm(num_windows, device=device) if shuffle else torch.arange(num_windows, device=device)
+        for start in range(0, num_windows, batch_size):
+            idx = order[start:start + batch_size]
+            b = len(idx)
+            edge_index, edge_attr = self._tiled_graph(b, num_nodes, device)
+            x = features[idx].reshape(b * num_nodes, num_feats)
+            yield Data(x=x, edge_index=edge_index, edge_attr=edge_attr, y=x, num_nodes=b * num_nodes)
+
+    def _gnn_cache_path(self, cor_time_frame, df_cal):
+        """Checkpoint path keyed on the calibration data, graph and hyperparameters."""
+        h = hashlib.sha256()
+        h.update(repr((list(cor_time_frame), df_cal.shape, list(df_cal.columns),
+                       sorted(_GNN_HPARAMS.items()))).encode())
+        h.update(np.ascontiguousarray(df_cal.to_numpy(dtype=np.float64)).tobytes())
+        h.update(self.edge_index.numpy().tobytes())
+        if self.edge_attr is not None:
+            h.update(self.edge_attr.numpy().tobytes())
+        return _MODELS_DIR / f"gnn_{h.hexdigest()[:16]}.pt"
+
+    def train_gnn(self, cor_time_frame, force_retrain=False):
         df_cal = self.pressures.loc[cor_time_frame[0]:cor_time_frame[1]]
         
         edge_data = self._load_edge_index()
@@ -128,71 +402,100 @@ class LeakDetector:
             return
             
         self.edge_index, self.edge_attr = edge_data
+        self._tiled_graphs = {}
         edge_dim = self.edge_attr.shape[1] if self.edge_attr is not None else None
 
         features = self._extract_gnn_features(df_cal) # (W, N, 4)
         num_windows, num_nodes, num_feats = features.shape
-        
-        # Standardize features
-        features_flat = einops.rearrange(features, 'w n f -> (w n) f')
-        self.gnn_scaler = StandardScaler()
-        features_scaled = torch.tensor(self.gnn_scaler.fit_transform(features_flat.numpy()), dtype=torch.float32)
-        features_scaled = einops.rearrange(features_scaled, '(w n) f -> w n f', n=num_nodes)
-        
-        # Train/Val Split (80/20)
-        split_idx = int(0.8 * num_windows)
-        
-        train_data_list = [
-            Data(x=features_scaled[i], edge_index=self.edge_index, edge_attr=self.edge_attr, y=features_scaled[i])
-            for i in range(split_idx)
-        ]
-        val_data_list = [
-            Data(x=features_scaled[i], edge_index=self.edge_index, edge_attr=self.edge_attr, y=features_scaled[i])
-            for i in range(split_idx, num_windows)
-        ]
-        
-        train_loader = DataLoader(train_data_list, batch_size=256, shuffle=True)
-        val_loader = DataLoader(val_data_list, batch_size=256, shuffle=False)
-        
+
         # Initialize model with LSTM
         self.gnn_model = AnomalyLeakDetector(
             node_in=num_feats, 
-            hid_dim=32, 
-            num_layers=4, 
+            hid_dim=_GNN_HPARAMS['hid_dim'], 
+            num_layers=_GNN_HPARAMS['num_layers'], 
             edge_in=edge_dim, 
             gnn_layer=GATv2Conv,
-            lstm_layers=1,
+            lstm_layers=_GNN_HPARAMS['lstm_layers'],
             window_size=num_feats
         ).to(self.device)
-        optimizer = torch.optim.AdamW(self.gnn_model.parameters(), lr=0.01, weight_decay=1e-4)
+
+        cache_path = self._gnn_cache_path(cor_time_frame, df_cal)
+        if not force_retrain and cache_path.exists():
+            try:
+                checkpoint = torch.load(cache_path, map_location=self.device, weights_only=True)
+                self.gnn_model.load_state_dict(checkpoint['state_dict'])
+                self.gnn_model.eval()
+                self.gnn_mean = checkpoint['gnn_mean']
+                self.gnn_std = checkpoint['gnn_std']
+                print(f"Loaded trained GNN from {cache_path.name}")
+                return
+            except Exception as e:
+                print(f"Warning: could not load GNN checkpoint ({e}). Retraining.")
+
+        print("Training GNN AnomalyLeakDetector on calibration period...")
+        
+        # Standardize features (z-score per window position, on the training device).
+        # Reduce over and broadcast against the strided unfold view directly, so the
+        # overlapping windows are only materialized once, as the scaled result.
+        features = features.to(self.device)
+        gnn_std, self.gnn_mean = torch.std_mean(features, dim=(0, 1), unbiased=False)
+        self.gnn_std = gnn_std + 1e-6
+        features_scaled = (features - self.gnn_mean) / self.gnn_std
+        
+        # Train/Val Split (80/20)
+        split_idx = int(0.8 * num_windows)
         
-        epochs = 30
+        train_features = features_scaled[:split_idx]
+        val_features = features_scaled[split_idx:]
+        batch_size = _GNN_HPARAMS['batch_size']
+        num_val_batches = -(-len(val_features) // batch_size)
+        
+        optimizer = torch.optim.AdamW(
+            self.gnn_model.parameters(),
+            lr=_GNN_HPARAMS['lr'],
+            weight_decay=_GNN_HPARAMS['weight_decay']
+        )
+        
+        # bf16 autocast and a compiled forward (see _GNN_CPU_ACCEL), plus TF32 matmuls
+        # on GPU. The compiled wrapper shares parameters with self.gnn_model, whose
+        # state_dict keys stay plain for the checkpoint. bf16 keeps fp32's range, so
+        # AdamW steps the fp32 master weights directly without a GradScaler.
+        use_cuda = self.device.type == 'cuda'
+        amp_dtype = self._gnn_amp_dtype()
+        train_model = self.gnn_model
+        if use_cuda:
+            torch.backends.cudnn.benchmark = True
+            torch.set_float32_matmul_precision('high')
+        if use_cuda or _GNN_CPU_ACCEL:
+            train_model = torch.compile(self.gnn_model, dynamic=True)
+
+        epochs = _GNN_HPARAMS['epochs']
         best_val_loss = float('inf')
-        patience = 5
+        patience = _GNN_HPARAMS['patience']
         patience_counter = 0
         
         for epoch in range(epochs):
             self.gnn_model.train()
-            train_loss = 0
-            for data in train_loader:
-                data = data.to(self.device)
+            for data in self._graph_batches(train_features, batch_size, shuffle=True):
                 optimizer.zero_grad()
-                out = self.gnn_model(data)
-                loss = F.mse_loss(out, data.y)
+                with torch.autocast(device_type=self.device.type, dtype=amp_dtype, enabled=amp_dtype is not None):
+                    out = train_model(data)
+                loss = F.mse_loss(out.float(), data.y)
                 loss.backward()
                 torch.nn.utils.clip_grad_norm_(self.gnn_model.parameters(), 1.0)
                 optimizer.step()
-                train_loss += loss.item()
                 
+            # Validation losses stay on the device until the epoch ends: one
+            # host sync per epoch instead of one per batch
             self.gnn_model.eval()
-            val_loss = 0
+            val_losses = []
             with torch.no_grad():
-                for data in val_loader:
-                    data = data.to(self.device)
-                    out = self.gnn_model(data)
-                    val_loss += F.mse_loss(out, data.y).item()
+                for data in self._graph_batches(val_features, batch_size):
+                    with torch.autocast(device_type=self.device.type, dtype=amp_dtype, enabled=amp_dtype is not None):
+                        out = train_model(data)
+                    val_losses.append(F.mse_loss(out.float(), data.y))
                     
-            val_loss /= len(val_loader)
+            val_loss = sum(torch.stack(val_losses).tolist()) / num_val_batches
             if val_loss < best_val_loss:
                 best_val_loss = val_loss
                 patience_counter = 0
@@ -203,10 +506,21 @@ class LeakDetector:
                     break
         print("GNN Training completed.")
 
-    def leak_analysis(self, cor_time_frame):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            torch.save({
+                'state_dict': self.gnn_model.state_dict(),
+                'gnn_mean': self.gnn_mean,
+                'gnn_std': self.gnn_std,
+            }, cache_path)
+        except OSError as e:
+            print(f"Warning: could not save GNN checkpoint ({e})")
+
+    def leak_analysis(self, cor_time_frame, n_jobs=-1):
         """
         Runs the linear regression across all nodes to find error residuals.
         Engineers a flow-to-pressure ratio to help differentiate high usage (demand) vs true leaks.
+        Regressors are fitted across `n_jobs` processes (joblib semantics, -1 = all cores).
         """
         N = len(self.nodes)
         T = self.pressures.shape[0]
@@ -216,87 +530,61 @@ class LeakDetector:
         # V = Flow array (assuming PUMP_1 is the input source)
         V = self.flows['PUMP_1'].values
 
-        res = np.zeros((N, T))
-        
-        # Store models since we cannot extract linear coefficients
-        # models[(i, j)] = trained RandomForestRegressor
-        models = {}
-
         print("Fitting regression models with Flow-to-Pressure ratio feature...")
 
-        for i, node in tqdm(enumerate(self.nodes), total=N, desc="Fitting RF Models"):
-            # Target variable: Specific node's pressure
-            y_tr = self.pressures[node].loc[cor_time_frame[0]:cor_time_frame[1]].values.reshape(-1, 1)
+        # Calibration window: targets P_cal[i] and every reference's (T_cal, 3)
+        # feature matrix X_cal[j], built once instead of sliced per (i, j) pair
+        P_cal = self.pressures.loc[cor_time_frame[0]:cor_time_frame[1]].values.T # (N, T_cal)
+        V_cal = self.flows['PUMP_1'].loc[cor_time_frame[0]:cor_time_frame[1]].values # (T_cal,)
+        X_cal = _regression_features(P_cal, V_cal) # (N, T_cal, 3)
 
-            # Iterating through a subset of reference nodes to save time with RFs.
+        pairs = []
+        for i in range(N):
+            # Iterating through a subset of reference nodes to save time with tree models.
             # E.g., just taking the previous, next, and one other node in the list.
             ref_indices = [(i-1)%N, (i+1)%N, (i+N//2)%N]
-            
-            # Using a sub-progress bar for reference sensors if needed, 
-            # but wrapping the main outer loop is better for visibility.
-            for j in ref_indices:
-                if i == j:
-                    continue # Ignore self
-                
-                node_cor = self.nodes[j]
-
-                # Feature 1: Reference Node Pressure
-                p_ref = self.pressures[node_cor].loc[cor_time_frame[0]:cor_time_frame[1]].values.reshape(-1, 1)
-                
-                # Feature 2: Flow source
-                v_tr = self.flows['PUMP_1'].loc[cor_time_frame[0]:cor_time_frame[1]].values.reshape(-1, 1)
-                
-                # ENGINEERED FEATURE: Flow-to-Pressure ratio (Demand vs Leak differentiator)
-                # Adds non-linearity. A hydrant open event shows a massive localized drop relative to systemic flow.
-                # Adding 1e-6 to avoid division by zero.
-                ratio_tr = v_tr / (p_ref + 1e-6)
+            pairs.extend((i, j) for j in ref_indices if j != i) # Ignore self
 
-                X_tr = np.concatenate([p_ref, v_tr, ratio_tr], axis=1)
-
-                model = RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42, n_jobs=-1)
-                model.fit(X_tr, y_tr.ravel())
-
-                # Save the trained model
-                models[(i, j)] = model
+        # Every (i, j) fit is independent: spread them over worker processes.
+        # Results are consumed as they finish (in submission order), so the
+        # bar tracks completed fits rather than dispatched tasks.
+        fits = Parallel(n_jobs=n_jobs, return_as="generator")(
+            delayed(_fit_reference_model)(X_cal[j], P_cal[i]) for i, j in pairs
+        )
+        fitted = list(tqdm(fits, total=len(pairs), desc="Fitting GBR Models"))
+        # Store models since we cannot extract linear coefficients
+        # models[(i, j)] = trained HistGradientBoostingRegressor
+        models = dict(zip(pairs, fitted))
 
         # Calculate error across all T
         print("Calculating residuals with batched inference...")
         
-        # Precompute features for all t
-        # P is (N, T), ratio is (N, T)
-        ratio = V / (P + 1e-6)
-        
-        P_pred_full = np.zeros((N, N, T))
-        # Default prediction for any node i using reference j is just P[i, t] (zero error)
-        # This covers self-prediction and any j that isn't in our sampled subset.
-        for i in range(N):
-            P_pred_full[i, :, :] = P[i, :]
-
-        # Batch prediction over all models
-        for (i, j), m in tqdm(models.items(), desc="RF Analysis Batch Predict"):
-            # Features for all t for this specific (i, j) model
-            # ref_pressure: P[j, :] (T,), source_flow: V (T,), ratio: ratio[j, :] (T,)
-            X_all = np.stack([P[j, :], V, ratio[j, :]], axis=1) # (T, 3)
-            P_pred_full[i, j, :] = m.predict(X_all) # (T,)
+        # Features only depend on the reference node j, so build each (T, 3)
+        # matrix once and share it between every model that references j.
+        models_by_ref = defaultdict(list)
+        for (i, j), m in models.items():
+            models_by_ref[j].append((i, m))
+
+        # Accumulate per-target error sums and squared norms instead of holding
+        # the full (N, N, T) error tensor. A reference without a model predicts
+        # P[i, t] exactly (zero error), so it contributes nothing to either.
+        node_error_sums = np.zeros((N, T), dtype=np.float32)
+        node_error_sq = np.zeros((N, T), dtype=np.float32)
+        for j, ref_models in tqdm(models_by_ref.items(), desc="GBR Analysis Batch Predict"):
+            X_j = _regression_features(P[j, :], V) # (T, 3)
+            for i, m in ref_models:
+                E_ij = np.subtract(P[i, :], m.predict(X_j), dtype=np.float32) # (T,)
+                np.clip(E_ij, 0, 1, out=E_ij)
+                node_error_sums[i] += E_ij
+                node_error_sq[i] += np.square(E_ij, out=E_ij)
 
-        # Vectorized Error calculation
-        # E[i, j, t] = P[i, t] - P_pred_full[i, j, t]
-        # P[:, np.newaxis, :] is (N, 1, T)
-        E = P[:, np.newaxis, :] - P_pred_full
-        E[E < 0] = 0
-        E = np.clip(E, 0, 1)
-
-        # Sum of errors for a given Target Node 'i' across all references 'j'
-        node_error_sums = np.sum(E, axis=1) # (N, T)
-        
         # Find the node that is deviating the most overall for each timestamp
         i_max_per_t = np.argmax(node_error_sums, axis=0) # (T,)
 
-        res = np.zeros((N, T))
-        for t in range(T):
-            im = i_max_per_t[t]
-            # Record the norm of the error vector for the worst node at time t
-            res[im, t] = np.linalg.norm(E[im, :, t])
+        # Record the norm of the error vector for the worst node at time t
+        t_idx = np.arange(T)
+        res = np.zeros((N, T), dtype=np.float32)
+        res[i_max_per_t, t_idx] = np.sqrt(node_error_sq[i_max_per_t, t_idx])
 
         MRE = pd.DataFrame(res.T, index=self.pressures.index, columns=self.nodes)
         return MRE
@@ -306,37 +594,96 @@ class LeakDetector:
         Runs CUSUM change point detection to find the exact timestamp a leak starts.
         """
         print("Running CUSUM Change Point Detection...")
-        ar_mean = np.zeros(df.shape[1])
-        ar_sigma = np.zeros(df.shape[1])
-        
-        for i, col in enumerate(df.columns):
-            traj = df[col].replace(0, np.nan).dropna()
-            if traj.empty:
-                continue
-            time_window = traj.index[0] + self.est_length
-            ar_mean[i] = traj.loc[:time_window].mean()
-            ar_sigma[i] = traj.loc[:time_window].std()
+        x = df.to_numpy(dtype=np.float32)
+
+        # Baseline stats over each column's first `est_length` of nonzero samples:
+        # per-column row windows [start, end) masked to valid samples, reduced in one pass
+        valid = (x != 0) & ~np.isnan(x)
+        has_data = valid.any(axis=0)
+        start = valid.argmax(axis=0)
+        end = df.index.searchsorted(df.index[start] + self.est_length, side='right')
+        x_cal = x[:end.max()]
+        rows = np.arange(len(x_cal))[:, None]
+        calib = valid[:len(x_cal)] & (rows >= start) & (rows < end)
+
+        n = calib.sum(axis=0)
+        # Accumulate in float64; only the stored series are float32
+        ar_mean = np.where(calib, x_cal, 0.0).sum(axis=0, dtype=np.float64) / np.maximum(n, 1)
+        sq_dev = np.where(calib, x_cal - ar_mean, 0.0) ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ar_sigma = np.sqrt(sq_dev.sum(axis=0) / (n - 1)) # sample std; NaN for a single sample
+        ar_mean[~has_data] = 0.0
+        ar_sigma[~has_data] = 0.0
 
         ar_K = (self.delta / 2) * ar_sigma
-        cumsum = np.zeros(df.shape)
         
         # Positive Cusum update
-        for i in range(1, df.shape[0]):
-            update_val = df.iloc[i, :] - ar_mean + cumsum[i-1, :] - ar_K
-            cumsum[i, :] = np.maximum(0, update_val)
+        cumsum = _cusum_scan(x, ar_mean, ar_K)
 
         df_cs = pd.DataFrame(cumsum, columns=df.columns, index=df.index)
 
-        leak_det = {}
-        for i, pipe in enumerate(df_cs.columns):
-            C_thr_abs = self.C_thr * ar_sigma[i]
-            alarms = df_cs[pipe] > C_thr_abs
-            if alarms.any():
-                leak_det[pipe] = df_cs.index[alarms][0]
-
+        # First alarm per column: (T, N) threshold mask, then argmax of the first True
+        C_thr_abs = self.C_thr * ar_sigma
+        alarms = cumsum > C_thr_abs[None, :]
+        first_alarm = alarms.argmax(axis=0)
+        leak_det = {
+            pipe: df_cs.index[first_alarm[i]]
+            for i, pipe in enumerate(df_cs.columns)
+            if alarms[first_alarm[i], i]
+        }
 
         return leak_det, df_cs
 
+    def _gnn_window(self, timestamp, pressures_df):
+        """Raw (N, W) GNN input for the 20 hours up to `timestamp`, or None if too short."""
+        window_start = timestamp - pd.Timedelta('20 hours')
+        df_window = pressures_df.loc[window_start:timestamp]
+        if len(df_window) < 120:
+            return None
+        features = self._extract_gnn_features(df_window.tail(120))
+        if features.shape[0] != 1:
+            return None
+        return features[0]
+
+    def _gnn_reconstruction_errors(self, windows):
+        """Mean absolute reconstruction error per node for stacked (L, N, W) windows -> (L, N)."""
+        num_windows, num_nodes, _ = windows.shape
+        f_scaled = (windows.to(self.device) - self.gnn_mean) / self.gnn_std
+
+        errors = []
+        amp_dtype = self._gnn_amp_dtype()
+        self.gnn_model.eval()
+        with torch.no_grad():
+            for data in self._graph_batches(f_scaled, batch_size=256):
+                with torch.autocast(device_type=self.device.type, dtype=amp_dtype, enabled=amp_dtype is not None):
+                    recon = self.gnn_model(data).float()
+                # Mean over the sequence window (dim=1 in reconstructed [N, W])
+                errors.append(torch.mean(torch.abs(data.y - recon), dim=1).cpu())
+        return torch.cat(errors).view(num_windows, num_nodes).numpy()
+
+    def precompute_gnn_errors(self, timestamps, pressures_df):
+        """
+        Run GNN inference for every detection timestamp in one batched pass, so that
+        subsequent `triangulate` calls on the same `pressures_df` skip their own
+        single-window forward pass.
+        """
+        self._gnn_errors_cache = {}
+        self._gnn_errors_source = pressures_df
+        if self.gnn_model is None or self.gnn_mean is None:
+            return
+
+        windows, valid_ts = [], []
+        for ts in dict.fromkeys(timestamps):
+            window = self._gnn_window(ts, pressures_df)
+            if window is not None:
+                windows.append(window)
+                valid_ts.append(ts)
+        if not windows:
+            return
+
+        errors = self._gnn_reconstruction_errors(torch.stack(windows))
+        self._gnn_errors_cache = dict(zip(valid_ts, errors))
+
     def triangulate(self, timestamp, df_cs, network, pressures_df, w_gnn=1.0, w_ent=1.0):
         """
         Calculates the triangulated leak position using Inverse Distance Weighting
@@ -351,26 +698,16 @@ class LeakDetector:
             return None
             
         gnn_node_errors = None
-        if self.gnn_model is not None and self.gnn_scaler is not None:
-            window_start = timestamp - pd.Timedelta('20 hours')
-            df_window = pressures_df.loc[window_start:timestamp]
-            if len(df_window) >= 120:
-                features = self._extract_gnn_features(df_window.tail(120))
-                if features.shape[0] == 1:
-                    num_nodes = features.shape[1]
-                    f_flat = einops.rearrange(features, 'w n f -> (w n) f')
-                    f_scaled = torch.tensor(self.gnn_scaler.transform(f_flat.numpy()), dtype=torch.float32)
-                    f_scaled = einops.rearrange(f_scaled, '(w n) f -> w n f', n=num_nodes)
-                    
-                    data = Data(x=f_scaled[0], edge_index=self.edge_index, edge_attr=self.edge_attr, y=f_scaled[0])
-                    data = data.to(self.device)
-                    self.gnn_model.eval()
-                    with torch.no_grad():
-                        recon = self.gnn_model(data)
-                        # Mean over the sequence window (dim=1 in reconstructed [N, W])
-                        gnn_node_errors = torch.mean(torch.abs(data.y - recon), dim=1).cpu().numpy()
-
-        coords = []
+        if self.gnn_model is not None and self.gnn_mean is not None:
+            if pressures_df is self._gnn_errors_source:
+                gnn_node_errors = self._gnn_errors_cache.get(timestamp)
+            if gnn_node_errors is None:
+                window = self._gnn_window(timestamp, pressures_df)
+                if window is not None:
+                    gnn_node_errors = self._gnn_reconstruction_errors(window.unsqueeze(0))[0]
+
+        node_row, node_xy = node_coordinates(network)
+        rows = []
         node_names = []
         
         # Collect raw components
@@ -378,35 +715,31 @@ class LeakDetector:
         raw_gnns = []
         raw_ents = []
         
+        # Entropy window rows, located once for all sensors (same bounds as .loc[start:timestamp])
         window_start = timestamp - self.est_length
+        lo, hi = pressures_df.index.slice_locs(window_start, timestamp)
 
         for node, error_val in top_sensors.items():
-            if node in network.node_name_list:
-                node_obj = network.get_node(node)
-                
-                node_idx = self.nodes.index(node)
+            # Coordinates come from the per-model array, one dict hit per sensor
+            row = node_row.get(node)
+            if row is not None:
+                node_idx = self.node_to_idx[node]
                 node_gnn_error = gnn_node_errors[node_idx] if gnn_node_errors is not None else 0
                 
-                series = pressures_df.loc[window_start:timestamp, node]
+                series = pressures_df[node].to_numpy()[lo:hi]
                 if len(series) > 10:
-                    f_ent = fourier_entropy_1d(series)
-                    p_ent = permutation_entropy_1d(series[::3])
-                    
-                    if np.isnan(f_ent): f_ent = 0
-                    if np.isnan(p_ent): p_ent = 0
-                    
-                    combined_ent = f_ent * (p_ent + 1e-3)
+                    combined_ent = combined_entropy_1d(series)
                 else:
                     combined_ent = 0
                 
-                coords.append(node_obj.coordinates)
+                rows.append(row)
                 node_names.append(node)
                 
                 raw_cusums.append(error_val)
                 raw_gnns.append(node_gnn_error)
                 raw_ents.append(combined_ent)
                 
-        if not coords:
+        if not rows:
             return None, None, None, None
             
         def minmax_scale(arr):
@@ -427,30 +760,11 @@ class LeakDetector:
             weights = np.ones_like(weights)
         weights = weights / np.sum(weights)
         
-        coords = np.array(coords)
+        coords = node_xy[rows]
         predicted_coord = np.sum(coords * weights[:, np.newaxis], axis=0)
 
         # Snap to nearest pipe topology
-        p = np.array(predicted_coord)
-        min_dist = float('inf')
-        snapped_coord = p
-        snapped_pipe = None
-        for name, link in network.links():
-            a = np.array(network.get_node(link.start_node_name).coordinates)
-            b = np.array(network.get_node(link.end_node_name).coordinates)
-            ab = b - a
-            ap = p - a
-            dot = np.dot(ab, ab)
-            if dot == 0:
-                proj = a
-            else:
-                t = np.clip(np.dot(ap, ab) / dot, 0.0, 1.0)
-                proj = a + t * ab
-            d = np.linalg.norm(p - proj)
-            if d < min_dist:
-                min_dist = d
-                snapped_coord = proj
-                snapped_pipe = name
+        snapped_coord, snapped_pipe = snap_to_nearest_link(predicted_coord, network)
 
         return tuple(snapped_coord), coords.tolist(), weights.tolist(), node_names, snapped_pipe
 
@@ -496,6 +810,21 @@ class LeakDetector:
             
         return fault_matrix
 
+    def _fault_matrix_arrays(self, fault_matrix):
+        """
+        (pipe ids, simulated drops (n_pipes, n_sensors) in self.nodes order, row norms)
+        for `fault_matrix`, built once and reused while the same matrix is passed in.
+        """
+        if self._fault_source is not fault_matrix:
+            pipe_ids = list(fault_matrix)
+            drops = np.array(
+                [[drop_dict.get(s, 0.0) for s in self.nodes] for drop_dict in fault_matrix.values()],
+                dtype=float,
+            ).reshape(len(pipe_ids), len(self.nodes))
+            self._fault_arrays = (pipe_ids, drops, np.linalg.norm(drops, axis=1))
+            self._fault_source = fault_matrix
+        return self._fault_arrays
+
     def localize_physics_based(self, timestamp, df_cs, network, fault_matrix):
         """
         Matches real SCADA pressure drop residuals to the simulated Fault Matrix.
@@ -507,47 +836,33 @@ class LeakDetector:
         
         if real_norm == 0:
             return None, None, None, None, None
-            
-        best_pipe = None
-        best_sim = -1
-        pipe_sims = {}
-        
-        for pipe_id, drop_dict in fault_matrix.items():
-            sim_vector = np.array([drop_dict.get(s, 0.0) for s in self.nodes])
-            sim_norm = np.linalg.norm(sim_vector)
-            
-            if sim_norm == 0:
-                sim = 0
-            else:
-                sim = np.dot(real_vector, sim_vector) / (real_norm * sim_norm)
-                
-            pipe_sims[pipe_id] = float(sim)
-            if sim > best_sim:
-                best_sim = sim
-                best_pipe = pipe_id
-                
-        if not best_pipe:
+
+        pipe_ids, drops, sim_norms = self._fault_matrix_arrays(fault_matrix)
+        if not pipe_ids:
             return None, None, None, None, None
-            
-        link = network.get_link(best_pipe)
-        a = np.array(network.get_node(link.start_node_name).coordinates)
-        b = np.array(network.get_node(link.end_node_name).coordinates)
+
+        # Cosine similarity against every simulated leak at once. A row-wise sum
+        # (not BLAS gemv, which blocks rows unevenly) keeps identical drop vectors at
+        # exactly equal similarity, so their tie order below stays deterministic.
+        sims = np.zeros(len(pipe_ids))
+        nonzero = sim_norms != 0
+        sims[nonzero] = (drops[nonzero] * real_vector).sum(axis=1) / (real_norm * sim_norms[nonzero])
+        best_pipe = pipe_ids[int(np.argmax(sims))]
+
+        # Pipe midpoints straight from the cached node array, all candidates at once
+        node_xy = node_coordinates(network)[1]
+        link_row, link_ends = link_endpoints(network)
+        a, b = node_xy[link_ends[link_row[best_pipe]]]
         best_coord = (a + b) / 2
         
-        sorted_pipes = sorted(pipe_sims.items(), key=lambda x: x[1], reverse=True)[:30]
-        
-        coords_list = []
-        weights_list = []
-        node_names = []
+        # Stable descending order, so equal similarities keep fault-matrix order
+        top = np.argsort(-sims, kind='stable')[:30]
+        top = top[~(sims[top] < 0.1)]
+        ends = link_ends[[link_row[pipe_ids[i]] for i in top]].reshape(-1, 2)
         
-        for pid, sim in sorted_pipes:
-            if sim < 0.1: continue
-            l = network.get_link(pid)
-            ca = np.array(network.get_node(l.start_node_name).coordinates)
-            cb = np.array(network.get_node(l.end_node_name).coordinates)
-            coords_list.append(((ca + cb) / 2).tolist())
-            weights_list.append(sim ** 3) 
-            node_names.append(pid)
+        coords_list = ((node_xy[ends[:, 0]] + node_xy[ends[:, 1]]) / 2).tolist()
+        weights_list = [float(sims[i]) ** 3 for i in top]
+        node_names = [pipe_ids[i] for i in top]
             
         w_sum = sum(weights_list)
         if w_sum > 0:
@@ -555,6 +870,43 @@ class LeakDetector:
             
         return tuple(best_coord), coords_list, weights_list, node_names, best_pipe
 
+def read_scada_csv(csv_path):
+    """
+    Read a SCADA export (';'-separated, ',' decimals) into a Timestamp-indexed frame.
+    The parsed frame is cached as .npz keyed on the file's path, size and mtime,
+    so later runs skip CSV and datetime parsing.
+    """
+    csv_path = Path(csv_path)
+    cache_path = file_cache_path("scada", csv_path, ".npz")
+    if cache_path.exists():
+        try:
+            with np.load(cache_path) as cached:
+                return pd.DataFrame(
+                    cached['values'],
+                    index=pd.DatetimeIndex(cached['index'], name='Timestamp'),
+                    columns=cached['columns'].tolist(),
+                )
+        except Exception as e:
+            print(f"Warning: ignoring unreadable SCADA cache {cache_path.name} ({e})")
+
+    raw = pd.read_csv(csv_path, dayfirst=True, sep=';', decimal=',')
+    raw.index = pd.to_datetime(raw['Timestamp'], format='ISO8601')
+    df = raw.drop('Timestamp', axis=1)
+
+    # Only single-dtype numeric frames round-trip through a plain (pickle-free) array
+    if df.dtypes.nunique() == 1 and pd.api.types.is_numeric_dtype(df.dtypes.iloc[0]):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                cache_path,
+                values=df.to_numpy(),
+                index=df.index.to_numpy(),
+                columns=np.array(df.columns, dtype=str),
+            )
+        except OSError as e:
+            print(f"Warning: could not cache {csv_path.name} ({e})")
+    return df
+
 class LILA_Pipeline:
     def __init__(self, data_dir, epanet_file=None):
         self.data_dir = data_dir
@@ -566,24 +918,13 @@ class LILA_Pipeline:
 
     def load_data(self):
         print("Loading SCADA Data...")
-        pressures_raw = pd.read_csv(
-            os.path.join(self.data_dir, 'Pressures.csv'),
-            dayfirst=True, sep=';', decimal=','
-        )
-        pressures_raw.index = pd.to_datetime(pressures_raw['Timestamp'])
-        self.pressures = pressures_raw.drop('Timestamp', axis=1)
-        
-        flows_raw = pd.read_csv(
-            os.path.join(self.data_dir, 'Flows.csv'),
-            dayfirst=True, sep=';', decimal=','
-        )
-        flows_raw.index = pd.to_datetime(flows_raw['Timestamp'])
-        self.flows = flows_raw.drop('Timestamp', axis=1)
+        self.pressures = read_scada_csv(os.path.join(self.data_dir, 'Pressures.csv'))
+        self.flows = read_scada_csv(os.path.join(self.data_dir, 'Flows.csv'))
         print(f"Loaded {len(self.pressures)} pressure constraints.")
 
     def load_network(self):
         if not self.epanet_file: return
-        self.network = wntr.network.WaterNetworkModel(self.epanet_file)
+        self.network = load_water_network(self.epanet_file)
 
     def run(self):
         self.load_data()
@@ -630,17 +971,16 @@ def evaluate_accuracy(detected_leaks, computed_df_cs, detector_obj, network, gro
     active_pipes = gt_df.drop('Timestamp', axis=1).max()
     active_pipes = active_pipes[active_pipes > 0].index.tolist()
     
-    true_coords = []
-    for pipe_id in active_pipes:
-        if pipe_id in network.link_name_list:
-            link = network.get_link(pipe_id)
-            start_coord = np.array(network.get_node(link.start_node_name).coordinates)
-            end_coord = np.array(network.get_node(link.end_node_name).coordinates)
-            mid_coord = (start_coord + end_coord) / 2
-            true_coords.append((pipe_id, mid_coord))
+    # Midpoints of all leaking pipes from the cached node/link arrays in one pass
+    node_xy = node_coordinates(network)[1]
+    link_row, link_ends = link_endpoints(network)
+    ends = link_ends[[link_row[p] for p in active_pipes if p in link_row]].reshape(-1, 2)
+    true_coords = (node_xy[ends[:, 0]] + node_xy[ends[:, 1]]) / 2
             
-    distances = []
+    pred_coords = []
     fault_matrix = getattr(pipeline, 'fault_matrix', None)
+    if not fault_matrix:
+        detector_obj.precompute_gnn_errors(detected_leaks.values(), detector_obj.pressures)
     for node, start_time in detected_leaks.items():
         if fault_matrix:
             res = detector_obj.localize_physics_based(start_time, computed_df_cs, network, fault_matrix)
@@ -649,20 +989,16 @@ def evaluate_accuracy(detected_leaks, computed_df_cs, detector_obj, network, gro
             
         if res[0] is None:
             continue
-        pred_coord = res[0]
-            
-        # Find minimum distance to any known ground truth leak
-        min_dist = float('inf')
-        for pipe_id, true_coord in true_coords:
-            dist = euclidean(pred_coord, true_coord)
-            if dist < min_dist:
-                min_dist = dist
-        
-        distances.append(min_dist)
-        
-    if distances:
-        return np.mean(distances)
-    return None
+        pred_coords.append(res[0])
+
+    if not pred_coords:
+        return None
+    if not len(true_coords):
+        return np.inf
+
+    # Minimum distance from each prediction to any known ground truth leak
+    distances = cdist(np.asarray(pred_coords, dtype=float), true_coords)
+    return np.mean(distances.min(axis=1))
 
 if __name__ == "__main__":
     _ROOT = Path(__file__).resolve().parents[2]
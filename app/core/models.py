@@ -101,7 +101,8 @@ class AnomalyLeakDetector(torch.nn.Module):
         self.dropout = torch.nn.Dropout(0.2)
 
     def forward(self, data):
-        x, edge_index, batch = data.x, data.edge_index, data.batch
+        # Stored datasets may hold float16 features / int32 indices
+        x, edge_index, batch = data.x.float(), data.edge_index.long(), data.batch
         edge_attr = data.edge_attr if self.edge_in else None
 
         for layer in self.encoder:
@@ -0,0 +1,14 @@
+"""On-disk cache location and file-keyed cache names shared by the pipeline and routers."""
+
+import hashlib
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / 'data' / 'models' / '.cache'
+
+
+def file_cache_path(prefix: str, path, suffix: str) -> Path:
+    """Cache file for ``path``, keyed on its resolved path, size and mtime so edits invalidate it."""
+    path = Path(path)
+    stat = path.stat()
+    key = hashlib.sha256(f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{prefix}_{path.stem}_{key}{suffix}"
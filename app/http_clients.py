@@ -0,0 +1,41 @@
+"""Shared outbound HTTP clients for the third-party APIs used by the routers.
+
+One pooled client per upstream lets repeated dispatch/report requests reuse
+keep-alive connections instead of paying a fresh TCP + TLS handshake each call.
+The clients are opened and closed by the application lifespan in ``main.py``.
+"""
+
+import httpx
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def open_clients():
+    """Create the pooled clients on application startup."""
+    _clients["elevenlabs"] = httpx.AsyncClient(timeout=30, limits=_LIMITS)
+    _clients["gemini"] = httpx.AsyncClient(timeout=30, limits=_LIMITS)
+
+
+async def close_clients():
+    """Close the pooled clients on application shutdown."""
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+
+def _get(name: str) -> httpx.AsyncClient:
+    # Fall back to lazy creation so the routers still work when the app is
+    # driven without its lifespan (e.g. a bare ASGI transport).
+    if name not in _clients:
+        _clients[name] = httpx.AsyncClient(timeout=30, limits=_LIMITS)
+    return _clients[name]
+
+
+def get_elevenlabs_client() -> httpx.AsyncClient:
+    return _get("elevenlabs")
+
+
+def get_gemini_client() -> httpx.AsyncClient:
+    return _get("gemini")
@@ -2,18 +2,61 @@
 AquaGuard Backend — FastAPI application entry point.
 """
 
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logging.basicConfig(level=os.getenv("AQUAGUARD_LOG_LEVEL", "WARNING").upper())
+
 from .routers import pipeline, sensors, network, savings, sandbox, dispatch, report
+from .http_clients import open_clients, close_clients, get_elevenlabs_client
+from .services.data_service import get_pressures_np, get_active_leak_pipes
+from .services.network_service import get_network
+
+logger = logging.getLogger("aquaguard")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    open_clients()
+    # Load the SCADA data, ground truth and EPANET model before serving so the
+    # first request to each endpoint doesn't pay for parsing them. A failure only
+    # skips that warm-up; the endpoint still loads (and reports errors) lazily.
+    loop = asyncio.get_running_loop()
+    warmups = (get_pressures_np, get_active_leak_pipes, get_network)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(None, warmup) for warmup in warmups),
+        return_exceptions=True,
+    )
+    for warmup, result in zip(warmups, results):
+        if isinstance(result, Exception):
+            logger.warning("Startup warm-up %s failed: %r", warmup.__name__, result)
+    # Comma-separated node ids whose dispatch audio is synthesized in the background
+    prewarm_ids = [n.strip() for n in os.getenv("AQUAGUARD_DISPATCH_PREWARM", "").split(",") if n.strip()]
+    prewarm = None
+    if prewarm_ids:
+        prewarm = asyncio.create_task(
+            dispatch.prewarm_dispatch_audio(prewarm_ids, get_elevenlabs_client())
+        )
+    yield
+    if prewarm is not None:
+        prewarm.cancel()
+    await close_clients()
+    sandbox.shutdown_leak_pool()
+
 
 app = FastAPI(
     title="AquaGuard API",
     description="Smart Water Leak Detection System — API Backend",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 import numpy as np
@@ -1,46 +1,136 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
+from pathlib import Path
+import hashlib
+import json
+import logging
 import os
 import httpx
 
+from ..disk_cache import CACHE_DIR
+from ..http_clients import get_elevenlabs_client
+
+logger = logging.getLogger("aquaguard.dispatch")
+
 router = APIRouter(prefix="/api/dispatch", tags=["dispatch"])
 
+MESSAGE_TEMPLATE = "Dispatching repair team to node {node_id}."
+
+# Use a generic voice (e.g. Rachel or arbitrary ElevenLabs standard voice)
+_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice
+_MODEL_ID = "eleven_turbo_v2_5"
+_VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.5}
+
+# Synthesized clips depend only on node_id once the template and voice are fixed,
+# so they are kept on disk; the version tag changes (and old files are ignored)
+# whenever any of those inputs does.
+_AUDIO_DIR = CACHE_DIR / 'dispatch'
+_AUDIO_VERSION = hashlib.sha256(
+    json.dumps([MESSAGE_TEMPLATE, _VOICE_ID, _MODEL_ID, _VOICE_SETTINGS], sort_keys=True).encode()
+).hexdigest()[:12]
+# Clips larger than this are streamed through without being kept for the cache
+_MAX_CACHED_AUDIO_BYTES = 2 * 1024 * 1024
+
+
 class DispatchRequest(BaseModel):
     node_id: str
 
-@router.post("")
-async def generate_dispatch_audio(req: DispatchRequest):
-    """Generate a voice alert for a specific node using ElevenLabs."""
-    api_key = os.getenv("ELEVENLABS_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="Missing ELEVENLABS_API_KEY")
 
-    message = f"Dispatching repair team to node {req.node_id}."
-    
-    # Use a generic voice (e.g. Rachel or arbitrary ElevenLabs standard voice)
-    voice_id = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    
+def _audio_path(node_id: str) -> Path:
+    # node_id is client-supplied, so hash it to keep the file name short and path-safe
+    digest = hashlib.sha256(node_id.encode()).hexdigest()[:16]
+    return _AUDIO_DIR / f"{_AUDIO_VERSION}_{digest}.mp3"
+
+
+def _tts_request(client: httpx.AsyncClient, node_id: str, api_key: str) -> httpx.Request:
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{_VOICE_ID}/stream"
     headers = {
         "Accept": "audio/mpeg",
         "Content-Type": "application/json",
         "xi-api-key": api_key
     }
-    
     payload = {
-        "text": message,
-        "model_id": "eleven_turbo_v2_5",
-        "voice_settings": {
-            "stability": 0.5,
-            "similarity_boost": 0.5
-        }
+        "text": MESSAGE_TEMPLATE.format(node_id=node_id),
+        "model_id": _MODEL_ID,
+        "voice_settings": _VOICE_SETTINGS,
     }
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, headers=headers)
-        
+    return client.build_request("POST", url, json=payload, headers=headers)
+
+
+def _store_audio(node_id: str, audio: bytes):
+    path = _audio_path(node_id)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".part")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not cache dispatch audio for %s (%s)", node_id, e)
+
+
+async def prewarm_dispatch_audio(node_ids, client: httpx.AsyncClient):
+    """
+    Synthesize and cache audio for `node_ids` that are not on disk yet. Runs as a
+    fire-and-forget task, so failures are logged here rather than raised.
+    """
+    api_key = os.getenv("ELEVENLABS_API_KEY")
+    if not api_key:
+        return
+    node_id = None
+    try:
+        for node_id in node_ids:
+            if _audio_path(node_id).exists():
+                continue
+            response = await client.send(_tts_request(client, node_id, api_key))
+            if response.status_code != 200:
+                logger.warning("Dispatch audio prewarm stopped at %s: %s", node_id, response.text[:200])
+                return
+            _store_audio(node_id, response.content)
+    except Exception as e:
+        logger.warning("Dispatch audio prewarm failed at %s: %r", node_id, e)
+
+
+@router.post("")
+async def generate_dispatch_audio(
+    req: DispatchRequest,
+    client: httpx.AsyncClient = Depends(get_elevenlabs_client),
+):
+    """Generate a voice alert for a specific node using ElevenLabs."""
+    api_key = os.getenv("ELEVENLABS_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=500, detail="Missing ELEVENLABS_API_KEY")
+
+    cached = _audio_path(req.node_id)
+    if cached.exists():
+        return FileResponse(cached, media_type="audio/mpeg")
+
+    # Stream the audio through as ElevenLabs synthesizes it instead of waiting for the full MP3
+    response = await client.send(_tts_request(client, req.node_id, api_key), stream=True)
+
     if response.status_code != 200:
+        await response.aread()
+        await response.aclose()
         raise HTTPException(status_code=response.status_code, detail=response.text)
-        
-    return Response(content=response.content, media_type="audio/mpeg")
+
+    async def relay_audio():
+        chunks = []
+        size = 0
+        try:
+            async for chunk in response.aiter_bytes():
+                if chunks is not None:
+                    size += len(chunk)
+                    if size <= _MAX_CACHED_AUDIO_BYTES:
+                        chunks.append(chunk)
+                    else:
+                        chunks = None
+                yield chunk
+        finally:
+            await response.aclose()
+        if chunks is not None:
+            _store_audio(req.node_id, b"".join(chunks))
+
+    return StreamingResponse(
+        relay_audio(), media_type="audio/mpeg", background=BackgroundTask(response.aclose)
+    )
@@ -1,21 +1,29 @@
 """Pipeline API endpoints."""
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter
 from ..services import pipeline_service
 from ..schemas import LeakResult, PipelineMetrics
 
 router = APIRouter(prefix="/api/pipeline", tags=["pipeline"])
 
+# The pipeline service keeps its detector and results in module state, so it runs
+# on one dedicated worker: concurrent first calls queue behind a single run and
+# then hit its cache, and the shared default threadpool stays free for I/O.
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline")
+
 
 @router.get("/run", response_model=list[LeakResult])
 async def run_pipeline():
     """Run the full detection pipeline and return detected leaks."""
-    # Run in thread pool so the heavy computation doesn't block the event loop
-    return await asyncio.to_thread(pipeline_service.run_pipeline)
+    # Run off the event loop so the heavy computation doesn't block it
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PIPELINE_EXECUTOR, pipeline_service.run_pipeline)
 
 
 @router.get("/metrics", response_model=PipelineMetrics)
 async def get_metrics():
     """Get pipeline accuracy metrics."""
-    return await asyncio.to_thread(pipeline_service.get_metrics)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PIPELINE_EXECUTOR, pipeline_service.get_metrics)
@@ -1,82 +1,171 @@
 """AI-powered leak report generation via Gemini API."""
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+import asyncio
+import hashlib
+import json
+import logging
 import os
 import httpx
-import traceback
+
+from ..http_clients import get_gemini_client
+from ..schemas import ReportResult
+from ..ttl_cache import TTLCache
+
+logger = logging.getLogger("aquaguard.report")
 
 router = APIRouter(prefix="/api/report", tags=["report"])
 
+_GEMINI_API = "https://generativelanguage.googleapis.com/v1beta"
+_GEMINI_MODEL = "gemini-flash-latest"
+
+# Static instructions lead the prompt so the prefix is identical across
+# requests and can be served from Gemini's cache; only the leak table varies.
+REPORT_PREAMBLE = """You are AquaGuard, an AI water leak detection system.
+Write a professional incident report summarizing these leak detection results from the L-TOWN water network.
+Include actionable recommendations. Use clear headings. Keep it under 300 words.
+"""
+
+# Explicit context caching is opt-in: it needs a model/prefix that meets
+# Gemini's minimum cacheable size, otherwise implicit prefix caching applies.
+_USE_CONTEXT_CACHE = os.getenv("AQUAGUARD_GEMINI_CONTEXT_CACHE") == "1"
+_cached_content: str | None = None
+
+# Identical leak/metric payloads (re-renders, demos) reuse the generated report
+_report_cache = TTLCache(maxsize=512, ttl=3600)
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _preamble_cache(client: httpx.AsyncClient, headers: dict) -> str | None:
+    """Return the cachedContents name holding the preamble, creating it if needed."""
+    global _cached_content
+    if _cached_content is None:
+        payload = {
+            "model": f"models/{_GEMINI_MODEL}",
+            "contents": [{"role": "user", "parts": [{"text": REPORT_PREAMBLE}]}],
+            "ttl": "3600s",
+        }
+        response = await client.post(f"{_GEMINI_API}/cachedContents", json=payload, headers=headers)
+        if response.status_code != 200:
+            logger.warning("Context cache unavailable: %s", response.text[:200])
+            return None
+        _cached_content = response.json()["name"]
+    return _cached_content
+
+
+def _drop_preamble_cache():
+    global _cached_content
+    _cached_content = None
+
 
 class ReportRequest(BaseModel):
     leaks: list[dict]
     metrics: dict | None = None
 
 
-@router.post("")
-async def generate_report(req: ReportRequest):
-    try:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise HTTPException(status_code=500, detail="Missing GEMINI_API_KEY")
-
-        # Build prompt
-        leak_lines = []
-        for i, leak in enumerate(req.leaks, 1):
-            wo = leak.get("work_order", {})
-            leak_lines.append(
-                f"  {i}. Node/Pipe: {wo.get('dispatch_target', leak.get('detected_node', 'Unknown'))}, "
-                f"Detected: {leak.get('estimated_start_time', 'N/A')}, "
-                f"Severity: {leak.get('estimated_cusum_severity', 0):.1f}, "
-                f"Loss: {wo.get('gallons_lost_per_hour', 'N/A')} gal/hr, "
-                f"Cost: ${wo.get('cost_per_hour', 'N/A')}/hr, "
-                f"Confidence: {wo.get('confidence_score', 'N/A')}%"
-            )
-
-        metrics_text = ""
-        if req.metrics:
-            metrics_text = (
-                f"\nPipeline Metrics:\n"
-                f"  - Leaks detected: {req.metrics.get('leaks_detected', 'N/A')}\n"
-                f"  - Ground truth leaks: {req.metrics.get('ground_truth_leaks', 'N/A')}\n"
-                f"  - Mean localization error: {req.metrics.get('mean_localization_error', 'N/A')}m\n"
-                f"  - Improvement: {req.metrics.get('improvement_pct', 'N/A')}%\n"
-            )
-
-        prompt = f"""You are AquaGuard, an AI water leak detection system.
-Write a professional incident report summarizing these leak detection results from the L-TOWN water network.
-Include actionable recommendations. Use clear headings. Keep it under 300 words.
-
+async def _request_report(req: ReportRequest, client: httpx.AsyncClient, api_key: str) -> str:
+    """Build the prompt for ``req`` and return the report text generated by Gemini."""
+    # Build prompt
+    leak_lines = []
+    for i, leak in enumerate(req.leaks, 1):
+        wo = leak.get("work_order", {})
+        leak_lines.append(
+            f"  {i}. Node/Pipe: {wo.get('dispatch_target', leak.get('detected_node', 'Unknown'))}, "
+            f"Detected: {leak.get('estimated_start_time', 'N/A')}, "
+            f"Severity: {leak.get('estimated_cusum_severity', 0):.1f}, "
+            f"Loss: {wo.get('gallons_lost_per_hour', 'N/A')} gal/hr, "
+            f"Cost: ${wo.get('cost_per_hour', 'N/A')}/hr, "
+            f"Confidence: {wo.get('confidence_score', 'N/A')}%"
+        )
+
+    metrics_text = ""
+    if req.metrics:
+        metrics_text = (
+            f"\nPipeline Metrics:\n"
+            f"  - Leaks detected: {req.metrics.get('leaks_detected', 'N/A')}\n"
+            f"  - Ground truth leaks: {req.metrics.get('ground_truth_leaks', 'N/A')}\n"
+            f"  - Mean localization error: {req.metrics.get('mean_localization_error', 'N/A')}m\n"
+            f"  - Improvement: {req.metrics.get('improvement_pct', 'N/A')}%\n"
+        )
+
+    body = f"""
 Detected Leaks:
 {chr(10).join(leak_lines)}
 {metrics_text}
 Write the report now:"""
 
-        url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-flash-latest:generateContent"
-        headers = {"Content-Type": "application/json", "X-goog-api-key": api_key}
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+    url = f"{_GEMINI_API}/models/{_GEMINI_MODEL}:generateContent"
+    headers = {"Content-Type": "application/json", "X-goog-api-key": api_key}
+    payload = {"contents": [{"parts": [{"text": REPORT_PREAMBLE + body}]}]}
 
-        print(f"[Report] Sending request to Gemini ({len(leak_lines)} leaks)...")
+    logger.debug("Sending request to Gemini (%d leaks)", len(leak_lines))
 
-        async with httpx.AsyncClient(timeout=30) as client:
+    cache_name = await _preamble_cache(client, headers) if _USE_CONTEXT_CACHE else None
+    if cache_name:
+        cached_payload = {"cachedContent": cache_name, "contents": [{"parts": [{"text": body}]}]}
+        response = await client.post(url, json=cached_payload, headers=headers)
+        if response.status_code == 404:
+            # Cache entry expired server-side; drop it so the next request recreates it
+            _drop_preamble_cache()
             response = await client.post(url, json=payload, headers=headers)
+    else:
+        response = await client.post(url, json=payload, headers=headers)
+
+    logger.debug("Gemini response status: %s", response.status_code)
+
+    if response.status_code != 200:
+        detail = response.text[:200]
+        logger.warning("Gemini error: %s", detail)
+        raise HTTPException(status_code=response.status_code, detail=f"Gemini API error: {detail}")
+
+    data = response.json()
+    text = data["candidates"][0]["content"]["parts"][0]["text"]
+    logger.info("Report generated (%d chars)", len(text))
+    return text
+
+
+def _finish_report(cache_key: str, task: asyncio.Task):
+    """Done callback of an in-flight report: cache a success, consume a failure."""
+    if _inflight.get(cache_key) is task:
+        del _inflight[cache_key]
+    if task.cancelled():
+        return
+    # exception() also marks the error retrieved if every waiter has gone away
+    if task.exception() is None:
+        _report_cache[cache_key] = task.result()
+
+
+@router.post("", response_model=ReportResult)
+async def generate_report(
+    req: ReportRequest,
+    client: httpx.AsyncClient = Depends(get_gemini_client),
+):
+    try:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="Missing GEMINI_API_KEY")
 
-        print(f"[Report] Gemini response status: {response.status_code}")
+        cache_key = hashlib.sha256(
+            json.dumps(req.model_dump(), sort_keys=True, default=str).encode()
+        ).hexdigest()
+        cached = _report_cache.get(cache_key)
+        if cached is not None:
+            return {"report": cached, "cached": True}
 
-        if response.status_code != 200:
-            detail = response.text[:200]
-            print(f"[Report] Gemini error: {detail}")
-            raise HTTPException(status_code=response.status_code, detail=f"Gemini API error: {detail}")
+        # Concurrent duplicates wait on the in-flight Gemini call instead of issuing
+        # their own. The call runs in its own task, so a caller disconnecting only
+        # stops its own wait, never the report the others are waiting for.
+        task = _inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(_request_report(req, client, api_key))
+            _inflight[cache_key] = task
+            task.add_done_callback(lambda t: _finish_report(cache_key, t))
 
-        data = response.json()
-        text = data["candidates"][0]["content"]["parts"][0]["text"]
-        print(f"[Report] Success! Report length: {len(text)} chars")
-        return JSONResponse({"report": text})
+        return {"report": await asyncio.shield(task)}
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[Report] Unexpected error: {traceback.format_exc()}")
+        logger.exception("Unexpected error generating report")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,102 +1,233 @@
 """City sandbox API endpoints."""
 
 import os
+import asyncio
+import math
+import json
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 from fastapi import APIRouter, Query, UploadFile, File, HTTPException
 from pydantic import BaseModel
+
+from ..disk_cache import file_cache_path
+from ..schemas import SandboxNetwork, SandboxSimResult
+from numba import njit
 import numpy as np
 import copy
 from functools import lru_cache
 
 import wntr
 
+# Caches are keyed on the file's mtime so re-uploading a network under the same
+# name invalidates them.
 @lru_cache(maxsize=10)
-def _get_base_network(file_path: str):
+def _get_base_network(file_path: str, mtime: float):
     """Cache the parsed WNTR model to avoid slow .inp parsing."""
     return wntr.network.WaterNetworkModel(file_path)
 
 def get_base_network(file_path: str):
     """Return a fresh deepcopy of the cached network."""
-    return copy.deepcopy(_get_base_network(file_path))
+    return copy.deepcopy(_get_base_network(file_path, os.path.getmtime(file_path)))
 
 @lru_cache(maxsize=10)
-def get_baseline_pressures(file_path: str):
-    """Cache the baseline EPANET simulation results to avoid redundant compute."""
+def _baseline_pressures(file_path: str, mtime: float):
+    cache_path = file_cache_path("baseline", file_path, ".json")
+    if cache_path.exists():
+        try:
+            return json.loads(cache_path.read_text())
+        except Exception as e:
+            print(f"Warning: ignoring unreadable baseline cache {cache_path.name} ({e})")
+
     wn = get_base_network(file_path)
     sim = wntr.sim.EpanetSimulator(wn)
     results = sim.run_sim()
-    return results.node["pressure"].iloc[-1].to_dict()
-
-def snap_prediction_to_pipe(pred_coord, pipe_map, node_map):
-    min_dist = float('inf')
-    best_coord = pred_coord
-    best_pipe = None
-    p = np.array(pred_coord)
-    for pid, pipe in pipe_map.items():
-        a = node_map[pipe["start"]][:2]
-        b = node_map[pipe["end"]][:2]
-        ab = b - a
-        ap = p - a
-        dot = np.dot(ab, ab)
-        if dot == 0:
-            proj = a
-        else:
-            t = np.clip(np.dot(ap, ab) / dot, 0.0, 1.0)
-            proj = a + t * ab
-        d = np.linalg.norm(p - proj)
-        if d < min_dist:
-            min_dist = d
-            best_coord = proj
-            best_pipe = pid
-    return best_coord, best_pipe
+    pressures = results.node["pressure"].iloc[-1].to_dict()
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(pressures))
+    except OSError as e:
+        print(f"Warning: could not write baseline cache ({e})")
+    return pressures
+
+def get_baseline_pressures(file_path: str):
+    """
+    Baseline (no-leak) EPANET pressures at the final timestep. Memoized per
+    file version in-process and on disk, so a restarted server stays warm.
+    """
+    return _baseline_pressures(file_path, os.path.getmtime(file_path))
+
+_leak_pool: ProcessPoolExecutor | None = None
+
+def _get_leak_pool() -> ProcessPoolExecutor:
+    """Process pool for leak simulations, created once and reused across requests."""
+    global _leak_pool
+    if _leak_pool is None:
+        # Created lazily inside the running (multithreaded) server, where fork
+        # could copy a lock held by another thread into the child; start workers
+        # from a clean forkserver process instead (spawn where that's unavailable)
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _leak_pool = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 1) - 1),
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _leak_pool
+
+def shutdown_leak_pool():
+    global _leak_pool
+    if _leak_pool is not None:
+        _leak_pool.shutdown(cancel_futures=True)
+        _leak_pool = None
+
+# Injected leak: a 1.5 cm radius hole, area = pi * r^2, as an emitter with
+# Cd = 0.75, i.e. Cd * area * sqrt(2g)
+_LEAK_EMITTER_COEFF = 0.75 * (math.pi * 0.015 ** 2) * math.sqrt(2 * 9.81)
+
+def _simulate_one_leak(file_path: str, leak_node_name: str, sensor_ids: list[str]):
+    """
+    Run EPANET with a leak emitter at `leak_node_name` and return the final
+    timestep pressures at `sensor_ids` as an array (NaN where a sensor has no
+    result), or None if the simulation fails. Runs in a pool worker.
+    """
+    wn_leak = get_base_network(file_path)
+    leak_node = wn_leak.get_node(leak_node_name)
+    leak_node.emitter_coefficient = _LEAK_EMITTER_COEFF
+
+    # Private scratch dir: concurrent workers would otherwise clobber each
+    # other's temp.inp/.rpt/.bin in the shared working directory
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            results_leak = wntr.sim.EpanetSimulator(wn_leak).run_sim(
+                file_prefix=os.path.join(tmp_dir, "temp")
+            )
+            return results_leak.node["pressure"].iloc[-1].reindex(sensor_ids).to_numpy()
+        except Exception:
+            return None
+
+class _NetworkArrays(NamedTuple):
+    """Node coordinates and pipe endpoints as contiguous arrays, plus id -> row maps."""
+    node_ids: list[str]
+    node_xy: np.ndarray        # (N, 2) float64
+    node_index: dict[str, int]
+    pipe_ids: list[str]
+    pipe_index: dict[str, int]
+    pipe_ends: np.ndarray      # (P, 2) rows into node_xy for start/end nodes
+
+def _network_arrays(nodes, pipes) -> _NetworkArrays:
+    node_ids = [n["id"] for n in nodes]
+    node_index = {nid: i for i, nid in enumerate(node_ids)}
+    pipe_ids = [p["id"] for p in pipes]
+    return _NetworkArrays(
+        node_ids=node_ids,
+        node_xy=np.array([[n["x"], n["y"]] for n in nodes], dtype=np.float64),
+        node_index=node_index,
+        pipe_ids=pipe_ids,
+        pipe_index={pid: i for i, pid in enumerate(pipe_ids)},
+        pipe_ends=np.array(
+            [[node_index[p["start"]], node_index[p["end"]]] for p in pipes], dtype=np.intp
+        ).reshape(-1, 2),
+    )
+
+@njit(cache=True)
+def _nearest_segment(px, py, node_xy, pipe_ends):
+    """
+    Index of the pipe segment closest to (px, py) and the projected point on it,
+    in one pass over the endpoints without (P, 2) temporaries.
+    """
+    best = 0
+    best_d = np.inf
+    best_x = px
+    best_y = py
+    for k in range(pipe_ends.shape[0]):
+        ax = node_xy[pipe_ends[k, 0], 0]
+        ay = node_xy[pipe_ends[k, 0], 1]
+        abx = node_xy[pipe_ends[k, 1], 0] - ax
+        aby = node_xy[pipe_ends[k, 1], 1] - ay
+        dot = abx * abx + aby * aby
+        # Zero-length pipes project onto their start node
+        t = ((px - ax) * abx + (py - ay) * aby) / (dot if dot != 0 else 1.0)
+        t = min(max(t, 0.0), 1.0)
+        qx = ax + t * abx
+        qy = ay + t * aby
+        # Squared distance ranks the same; no sqrt needed
+        d = (px - qx) ** 2 + (py - qy) ** 2
+        if d < best_d:
+            best_d = d
+            best = k
+            best_x = qx
+            best_y = qy
+    return best, best_x, best_y
+
+def snap_prediction_to_pipe(pred_coord, net: _NetworkArrays):
+    """Project `pred_coord` onto the nearest pipe segment; returns (point, pipe_id)."""
+    if not net.pipe_ids:
+        return pred_coord, None
+    best, x, y = _nearest_segment(float(pred_coord[0]), float(pred_coord[1]), net.node_xy, net.pipe_ends)
+    return np.array([x, y]), net.pipe_ids[best]
 
 
 router = APIRouter(prefix="/api/sandbox", tags=["sandbox"])
 
 
-@router.get("/generate")
-async def generate_network(
-    rows: int = Query(6, ge=3, le=15),
-    cols: int = Query(8, ge=3, le=15),
-    sensors: int = Query(5, ge=2, le=50),
-    density: float = Query(0.3, ge=0.0, le=1.0),
-):
-    """Procedurally generate a grid-based water network."""
+@lru_cache(maxsize=64)
+def _build_procedural(rows: int, cols: int, sensors: int, density: float):
+    """Grid layout behind generate_network; a pure function of its (seeded) inputs."""
     rng = np.random.RandomState(rows * 100 + cols * 10 + sensors + int(density * 1000))
     spacing = 100.0
 
-    nodes = []
-    node_ids = []
-    for r in range(rows):
-        for c in range(cols):
-            nid = f"J-{r}-{c}"
-            jx = rng.uniform(-spacing * 0.15, spacing * 0.15)
-            jy = rng.uniform(-spacing * 0.15, spacing * 0.15)
-            nodes.append({
-                "id": nid,
-                "x": float(c * spacing + jx),
-                "y": float(r * spacing + jy),
-            })
-            node_ids.append(nid)
-
-    pipes = []
-    pid_counter = 0
-    for r in range(rows):
-        for c in range(cols):
-            nid = f"J-{r}-{c}"
-            if c + 1 < cols:
-                pipes.append({"id": f"P-{pid_counter}", "start": nid, "end": f"J-{r}-{c+1}"})
-                pid_counter += 1
-            if r + 1 < rows:
-                pipes.append({"id": f"P-{pid_counter}", "start": nid, "end": f"J-{r+1}-{c}"})
-                pid_counter += 1
-            if r + 1 < rows and c + 1 < cols and rng.random() < density:
-                pipes.append({"id": f"P-{pid_counter}", "start": nid, "end": f"J-{r+1}-{c+1}"})
-                pid_counter += 1
+    # Same draw order as a row-major walk: (jx, jy) per node, then one diagonal
+    # coin per interior cell, then the sensor choice
+    jitter = rng.uniform(-spacing * 0.15, spacing * 0.15, size=(rows, cols, 2))
+    rr, cc = np.meshgrid(np.arange(rows), np.arange(cols), indexing="ij")
+    xs = (cc * spacing + jitter[..., 0]).ravel().tolist()
+    ys = (rr * spacing + jitter[..., 1]).ravel().tolist()
+    node_ids = [f"J-{r}-{c}" for r in range(rows) for c in range(cols)]
+    nodes = [{"id": nid, "x": x, "y": y} for nid, x, y in zip(node_ids, xs, ys)]
+
+    # Candidate edges per cell in emission order: right, down, diagonal
+    idx = np.arange(rows * cols).reshape(rows, cols)
+    ends = np.stack([idx + 1, idx + cols, idx + cols + 1], axis=-1)
+    valid = np.zeros((rows, cols, 3), dtype=bool)
+    valid[:, :-1, 0] = True
+    valid[:-1, :, 1] = True
+    valid[:-1, :-1, 2] = rng.random_sample((rows - 1, cols - 1)) < density
+    starts = np.broadcast_to(idx[..., None], ends.shape)[valid].tolist()
+    pipes = [
+        {"id": f"P-{k}", "start": node_ids[a], "end": node_ids[b]}
+        for k, (a, b) in enumerate(zip(starts, ends[valid].tolist()))
+    ]
 
     sensor_indices = rng.choice(len(node_ids), size=min(sensors, len(node_ids)), replace=False)
     sensor_list = [node_ids[i] for i in sensor_indices]
 
+    return nodes, pipes, sensor_list
+
+
+@lru_cache(maxsize=64)
+def _procedural_arrays(rows: int, cols: int, sensors: int, density: float):
+    """
+    Array form of a procedural grid for /simulate, plus the sensor ids and their
+    (S, 2) coordinate slab. Treat the returned structures as read-only.
+    """
+    nodes, pipes, sensor_list = _build_procedural(rows, cols, sensors, density)
+    net = _network_arrays(nodes, pipes)
+    sensor_ids = list(sensor_list)
+    sensor_xy = net.node_xy[[net.node_index[s] for s in sensor_ids]]
+    return net, sensor_ids, sensor_xy
+
+
+@router.get("/generate", response_model=SandboxNetwork)
+async def generate_network(
+    rows: int = Query(6, ge=3, le=15),
+    cols: int = Query(8, ge=3, le=15),
+    sensors: int = Query(5, ge=2, le=50),
+    density: float = Query(0.3, ge=0.0, le=1.0),
+):
+    """Procedurally generate a grid-based water network."""
+    nodes, pipes, sensor_list = _build_procedural(rows, cols, sensors, density)
     return {"nodes": nodes, "pipes": pipes, "sensors": sensor_list}
 
 
@@ -109,7 +240,32 @@ async def list_sample_networks():
     return {"networks": SAMPLE_INP_FILES}
 
 
-@router.get("/load-inp")
+@lru_cache(maxsize=10)
+def _inp_layout(file_path: str, mtime: float):
+    """Node and pipe lists for an .inp file, read from the shared (unmutated) model."""
+    wn = _get_base_network(file_path, mtime)
+
+    # Extract ALL nodes (junctions, tanks, reservoirs)
+    nodes = []
+    for name, node in wn.nodes():
+        coords = node.coordinates
+        nodes.append({"id": name, "x": float(coords[0]), "y": float(coords[1])})
+
+    # Extract pipes
+    pipes = []
+    for name, link in wn.pipes():
+        pipes.append({"id": name, "start": link.start_node_name, "end": link.end_node_name})
+
+    return nodes, pipes
+
+
+@lru_cache(maxsize=10)
+def _inp_arrays(file_path: str, mtime: float) -> _NetworkArrays:
+    """Array form of an .inp network for /simulate. Treat as read-only."""
+    return _network_arrays(*_inp_layout(file_path, mtime))
+
+
+@router.get("/load-inp", response_model=SandboxNetwork)
 async def load_inp_network(
     filename: str = Query(...),
     sensors: int = Query(8, ge=2, le=50),
@@ -122,24 +278,10 @@ async def load_inp_network(
             raise HTTPException(status_code=404, detail=f"Network file not found: {filename}")
 
     try:
-        wn = get_base_network(str(file_path))
+        nodes, pipes = _inp_layout(str(file_path), os.path.getmtime(file_path))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse .inp file: {e}")
-
-    # Extract ALL nodes (junctions, tanks, reservoirs)
-    nodes = []
-    node_ids = []
-    for name in wn.node_name_list:
-        node = wn.get_node(name)
-        coords = node.coordinates
-        nodes.append({"id": name, "x": float(coords[0]), "y": float(coords[1])})
-        node_ids.append(name)
-
-    # Extract pipes
-    pipes = []
-    for name in wn.pipe_name_list:
-        link = wn.get_link(name)
-        pipes.append({"id": name, "start": link.start_node_name, "end": link.end_node_name})
+    node_ids = [n["id"] for n in nodes]
 
     # Randomly select sensors from junctions
     rng = np.random.RandomState(len(nodes))
@@ -159,7 +301,7 @@ class SimulateRequest(BaseModel):
     filename: str | None = None  # Optional: if set, load network from .inp file
 
 
-@router.post("/simulate")
+@router.post("/simulate", response_model=SandboxSimResult)
 async def simulate(req: SimulateRequest):
     """Simulate leak detection on a generated or real network."""
     rng = np.random.RandomState(42)
@@ -176,59 +318,55 @@ async def simulate(req: SimulateRequest):
 
         # Need the node/pipe data for coordinates
         gen = await load_inp_network(req.filename, req.sensors)
-        node_map = {n["id"]: np.array([n["x"], n["y"]]) for n in gen["nodes"]}
-        pipe_map = {p["id"]: p for p in gen["pipes"]}
+        net = _inp_arrays(str(file_path), os.path.getmtime(file_path))
         sensor_list = gen["sensors"]
 
         # Run Baseline Simulation using caching
         base_pressures = get_baseline_pressures(str(file_path))
-
-        for lpid in req.leak_pipes:
-            if lpid not in pipe_map:
-                continue
-            pipe = pipe_map[lpid]
-            true_coord = (node_map[pipe["start"]] + node_map[pipe["end"]]) / 2
-
-            # Run Leak Simulation
-            wn_leak = get_base_network(str(file_path))
-            leak_node = wn_leak.get_node(pipe["start"])
-            
-            # Inject leak: area = pi * r^2. Let's say a 1.5 cm radius hole.
-            leak_area = np.pi * (0.015) ** 2
-            leak_node.emitter_coefficient = 0.75 * leak_area * np.sqrt(2 * 9.81)
-
-            sim_leak = wntr.sim.EpanetSimulator(wn_leak)
-            try:
-                results_leak = sim_leak.run_sim()
-                leak_pressures = results_leak.node["pressure"].iloc[-1]
-            except Exception:
+        sensor_ids = [s for s in sensor_list if s in base_pressures]
+        sensor_xy = net.node_xy[[net.node_index[s] for s in sensor_ids]]
+        base_vals = np.array([base_pressures[s] for s in sensor_ids])
+
+        # Run Leak Simulations: independent EPANET runs fanned out across the pool
+        leak_pipes = [lpid for lpid in req.leak_pipes if lpid in net.pipe_index]
+        loop = asyncio.get_running_loop()
+        pool = _get_leak_pool()
+        leak_results = await asyncio.gather(*(
+            loop.run_in_executor(
+                pool, _simulate_one_leak, str(file_path),
+                net.node_ids[net.pipe_ends[net.pipe_index[lpid], 0]], sensor_ids,
+            )
+            for lpid in leak_pipes
+        ))
+
+        for lpid, leak_vals in zip(leak_pipes, leak_results):
+            start, end = net.pipe_ends[net.pipe_index[lpid]]
+            true_coord = (net.node_xy[start] + net.node_xy[end]) / 2
+
+            if leak_vals is None:
                 continue # Skip if simulation fails
-            
+
             # Calculate absolute pressure residuals at sensors
-            sensor_residuals = {}
-            for s in sensor_list:
-                if s in base_pressures and s in leak_pressures:
-                    residual = abs(base_pressures[s] - leak_pressures[s])
-                    # Add tiny noise to avoid perfect ties
-                    residual += rng.uniform(0, 0.001)
-                    sensor_residuals[s] = residual
-
-            if not sensor_residuals:
+            present = np.flatnonzero(~np.isnan(leak_vals))
+            if present.size == 0:
                 continue
+            residuals = np.abs(base_vals[present] - leak_vals[present])
+            # Add tiny noise to avoid perfect ties
+            residuals += rng.uniform(0, 0.001, size=present.size)
 
             # Sort sensors by highest pressure drop (most likely near leak)
-            sorted_sensors = sorted(sensor_residuals.items(), key=lambda x: x[1], reverse=True)
-            top_k = min(5, len(sorted_sensors))
-            top_sensors = sorted_sensors[:top_k]
-            
-            top_w = np.array([float(s[1]) for s in top_sensors]) + 1e-6 # Weights = pressure drop
-            top_nodes = [s[0] for s in top_sensors]
-            top_c = np.array([node_map[n] for n in top_nodes])
+            k = min(5, residuals.size)
+            top_idx = np.argpartition(residuals, -k)[-k:]
+            top_idx = top_idx[np.argsort(-residuals[top_idx], kind="stable")]
+
+            top_w = residuals[top_idx] + 1e-6 # Weights = pressure drop
+            top_nodes = [sensor_ids[present[i]] for i in top_idx]
+            top_c = sensor_xy[present[top_idx]]
             
             top_w_norm = top_w / top_w.sum()
             raw_pred_coord = np.sum(top_c * top_w_norm[:, None], axis=0)
 
-            pred_coord, snapped_pipe = snap_prediction_to_pipe(raw_pred_coord, pipe_map, node_map)
+            pred_coord, snapped_pipe = snap_prediction_to_pipe(raw_pred_coord, net)
 
             err = float(np.linalg.norm(pred_coord - true_coord))
             errors.append(err)
@@ -264,38 +402,32 @@ async def simulate(req: SimulateRequest):
 
     else:
         # ── PROCEDURAL GRID: GEOMETRIC SIMULATION ──
-        gen = await generate_network(req.rows, req.cols, req.sensors, req.density)
-        node_map = {n["id"]: np.array([n["x"], n["y"]]) for n in gen["nodes"]}
-        pipe_map = {p["id"]: p for p in gen["pipes"]}
-        sensor_coords = {s: node_map[s] for s in gen["sensors"]}
+        net, sensor_ids, sensor_xy = _procedural_arrays(
+            req.rows, req.cols, req.sensors, req.density
+        )
 
         for lpid in req.leak_pipes:
-            if lpid not in pipe_map:
+            if lpid not in net.pipe_index:
                 continue
-            pipe = pipe_map[lpid]
-            true_coord = (node_map[pipe["start"]] + node_map[pipe["end"]]) / 2
-
-            weights = []
-            coords_list = []
-            node_names = []
-            for sn, sc in sensor_coords.items():
-                dist = np.linalg.norm(true_coord - sc) + 1e-6
-                noise_scale = dist * 0.05
-                noisy_sc = sc + rng.normal(0, noise_scale, size=2)
-                w = 1.0 / (dist ** 2)
-                weights.append(w)
-                coords_list.append(noisy_sc)
-                node_names.append(sn)
-
-            top_idx = np.argsort(weights)[-5:]
-            top_w = np.array([weights[i] for i in top_idx])
-            top_c = np.array([coords_list[i] for i in top_idx])
-            top_nodes = [node_names[i] for i in top_idx]
+            start, end = net.pipe_ends[net.pipe_index[lpid]]
+            true_coord = (net.node_xy[start] + net.node_xy[end]) / 2
+
+            # All sensors at once: one distance pass and one noise draw per leak
+            dist = np.linalg.norm(true_coord - sensor_xy, axis=1) + 1e-6
+            noisy_xy = sensor_xy + rng.normal(0, (dist * 0.05)[:, None], size=sensor_xy.shape)
+            weights = 1.0 / (dist ** 2)
+
+            k = min(5, len(weights))
+            top_idx = np.argpartition(weights, -k)[-k:]
+            top_idx = top_idx[np.argsort(weights[top_idx])]
+            top_w = weights[top_idx]
+            top_c = noisy_xy[top_idx]
+            top_nodes = [sensor_ids[i] for i in top_idx]
 
             top_w_norm = top_w / top_w.sum()
             raw_pred_coord = np.sum(top_c * top_w_norm[:, None], axis=0)
 
-            pred_coord, snapped_pipe = snap_prediction_to_pipe(raw_pred_coord, pipe_map, node_map)
+            pred_coord, snapped_pipe = snap_prediction_to_pipe(raw_pred_coord, net)
 
             err = float(np.linalg.norm(pred_coord - true_coord))
             errors.append(err)
@@ -341,6 +473,30 @@ async def simulate(req: SimulateRequest):
     }
 
 
+# Largest accepted .inp upload (L-TOWN, the biggest bundled network, is ~0.4 MB)
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+
+def _save_upload(src, dest: Path) -> bool:
+    """
+    Copy the upload stream to `dest` in 1 MiB chunks. Returns False, leaving `dest`
+    untouched, once more than MAX_UPLOAD_BYTES have been read.
+    """
+    tmp = dest.with_suffix(".part")
+    total = 0
+    try:
+        with open(tmp, "wb") as out:
+            while chunk := src.read(1 << 20):
+                total += len(chunk)
+                if total > MAX_UPLOAD_BYTES:
+                    return False
+                out.write(chunk)
+        os.replace(tmp, dest)
+        return True
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
 @router.post("/upload-network")
 async def upload_network(file: UploadFile = File(...)):
     """Upload a custom .inp water network file."""
@@ -351,9 +507,12 @@ async def upload_network(file: UploadFile = File(...)):
     upload_dir.mkdir(parents=True, exist_ok=True)
     
     file_path = upload_dir / file.filename
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    # Stream to disk off the event loop instead of reading the whole file into memory
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(None, _save_upload, file.file, file_path):
+        raise HTTPException(
+            status_code=413, detail=f"Network file exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+        )
         
     return {"filename": file.filename, "status": "success"}
 
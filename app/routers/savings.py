@@ -1,57 +1,134 @@
 """Savings calculator API endpoints."""
 
+from functools import lru_cache
+from typing import NamedTuple
+
 from fastapi import APIRouter, Query
-import pandas as pd
+from numba import njit
+import numpy as np
 
-from ..services.data_service import get_ground_truth_raw
+from ..services.data_service import get_ground_truth_np
+from ..schemas import SavingsResult
 
 router = APIRouter(prefix="/api/savings", tags=["savings"])
 
 DT_SEC = 300  # 5-minute sampling interval
 
 
-@router.get("/compute")
-async def compute_savings(
-    water_cost: float = Query(2.50, ge=0.5, le=20.0),
-    repair_cost: float = Query(8500, ge=1000, le=100000),
-    detection_speedup: int = Query(7, ge=1, le=30),
-):
-    """Compute economic savings from early leak detection."""
-    gt = get_ground_truth_raw()
-    gt_ts = gt.set_index('Timestamp')
-
-    active_pipes = [c for c in gt_ts.columns if gt_ts[c].max() > 0]
-
-    leak_stats = []
-    for pipe in active_pipes:
-        series = gt_ts[pipe]
-        active = series[series > 0]
-        if len(active) == 0:
-            continue
-        start_time = active.index[0]
-        end_time = active.index[-1]
-        duration_days = (end_time - start_time).total_seconds() / 86400
-        total_liters = active.sum() * DT_SEC
-        total_m3 = total_liters / 1000
-        peak_lps = float(active.max())
-        avg_lps = float(active.mean())
-        saved_liters = avg_lps * detection_speedup * 86400
-        saved_m3 = saved_liters / 1000
-
-        leak_stats.append({
+@njit(cache=True)
+def _leak_stats(arr):
+    """
+    One scan per column of the (T, N) leak-flow array: index of the first and last
+    positive sample, sum and count of positive samples, and the column maximum.
+    first/last are -1 for columns that never leak.
+    """
+    T, N = arr.shape
+    first = np.full(N, -1, dtype=np.int64)
+    last = np.full(N, -1, dtype=np.int64)
+    total = np.zeros(N)
+    count = np.zeros(N, dtype=np.int64)
+    peak = np.full(N, -np.inf)
+    for j in range(N):
+        for t in range(T):
+            v = arr[t, j]
+            if v > peak[j]:
+                peak[j] = v
+            if v > 0.0:
+                if first[j] < 0:
+                    first[j] = t
+                last[j] = t
+                total[j] += v
+                count[j] += 1
+    return first, last, total, count, peak
+
+
+class _LeakArrays(NamedTuple):
+    """Per-pipe leak stats, one entry per leaking pipe. Rounded columns are JSON-ready lists."""
+    pipes: list[str]
+    starts: list[str]
+    duration_days: list[float]  # rounded to 0.1
+    peak_lps: list[float]  # rounded to 0.01
+    avg_lps_r: list[float]  # rounded to 0.01
+    total_m3_r: list[float]  # rounded to 1
+    avg_lps: np.ndarray
+    total_m3: np.ndarray
+
+
+@lru_cache(maxsize=1)
+def _leak_invariants():
+    """
+    Cost-independent parts of the savings computation: per-pipe leak stats from
+    the (module-cached) ground truth arrays and the downsampled cumulative loss
+    timeline.
+    """
+    arr, pipes, times = get_ground_truth_np()
+
+    # Column-wise stats for every pipe in one native pass over the underlying array
+    first_i, last_i, total, count, peak = _leak_stats(arr)
+    is_active = count > 0
+    active_pipes = [pipe for pipe, active in zip(pipes, is_active) if active]
+
+    active_sum = total[is_active]
+    peak = peak[is_active]
+    mean = active_sum / count[is_active]
+    first = times[first_i[is_active]]
+    last = times[last_i[is_active]]
+    duration_days = (last - first).total_seconds().to_numpy() / 86400
+    total_m3 = active_sum * DT_SEC / 1000
+
+    leaks = _LeakArrays(
+        pipes=active_pipes,
+        starts=first.astype(str).tolist(),
+        duration_days=np.round(duration_days, 1).tolist(),
+        peak_lps=np.round(peak, 2).tolist(),
+        avg_lps_r=np.round(mean, 2).tolist(),
+        total_m3_r=np.round(total_m3).tolist(),
+        avg_lps=mean,
+        total_m3=total_m3,
+    )
+
+    # Cumulative timeline (downsampled)
+    cum_volume = (arr[:, is_active].sum(axis=1) * DT_SEC / 1000).cumsum()
+    step = max(1, len(cum_volume) // 500)
+    timeline = [
+        {"timestamp": ts, "cumulative_m3": v}
+        for ts, v in zip(times[::step].astype(str).tolist(), np.round(cum_volume[::step]).tolist())
+    ]
+    return leaks, timeline
+
+
+@lru_cache(maxsize=128)
+def _compute_savings(water_cost: float, repair_cost: float, detection_speedup: int) -> dict:
+    leaks, timeline = _leak_invariants()
+
+    # Cost-dependent columns, rounded in one pass each
+    saved_m3 = leaks.avg_lps * detection_speedup * 86400 / 1000
+    saved_m3_r = np.round(saved_m3).tolist()
+    lost_cost_r = np.round(leaks.total_m3 * water_cost).tolist()
+    savings_r = np.round(saved_m3 * water_cost).tolist()
+
+    leak_stats = [
+        {
             "pipe": pipe,
-            "start": str(start_time),
-            "duration_days": round(duration_days, 1),
-            "total_m3": round(total_m3, 0),
-            "saved_m3": round(saved_m3, 0),
-            "peak_lps": round(peak_lps, 2),
-            "avg_lps": round(avg_lps, 2),
-            "water_lost_cost": round(total_m3 * water_cost, 0),
-            "potential_savings": round(saved_m3 * water_cost, 0),
-        })
-
-    total_lost_m3 = sum(l["total_m3"] for l in leak_stats)
-    total_saved_m3 = sum(l["saved_m3"] for l in leak_stats)
+            "start": start,
+            "duration_days": duration_days,
+            "total_m3": total_m3,
+            "saved_m3": saved,
+            "peak_lps": peak_lps,
+            "avg_lps": avg_lps,
+            "water_lost_cost": lost_cost,
+            "potential_savings": potential,
+        }
+        for pipe, start, duration_days, total_m3, saved, peak_lps, avg_lps, lost_cost, potential in zip(
+            leaks.pipes, leaks.starts, leaks.duration_days, leaks.total_m3_r, saved_m3_r,
+            leaks.peak_lps, leaks.avg_lps_r, lost_cost_r, savings_r,
+        )
+    ]
+
+    # Totals straight from the rounded column lists (same left-to-right float sums
+    # as over the dicts, without a generator and key lookup per leak)
+    total_lost_m3 = sum(leaks.total_m3_r)
+    total_saved_m3 = sum(saved_m3_r)
     total_lost_cost = total_lost_m3 * water_cost
     total_saved_cost = total_saved_m3 * water_cost
     total_repair_savings = len(leak_stats) * repair_cost * 0.3
@@ -59,14 +136,6 @@ async def compute_savings(
     system_cost = 50000
     roi = ((total_combined - system_cost) / system_cost) * 100
 
-    # Cumulative timeline (downsampled)
-    cum_volume = (gt_ts[active_pipes].sum(axis=1) * DT_SEC / 1000).cumsum()
-    step = max(1, len(cum_volume) // 500)
-    timeline = [
-        {"timestamp": str(ts), "cumulative_m3": round(float(v), 0)}
-        for ts, v in cum_volume.iloc[::step].items()
-    ]
-
     return {
         "total_lost_m3": round(total_lost_m3, 0),
         "total_lost_cost": round(total_lost_cost, 0),
@@ -76,7 +145,17 @@ async def compute_savings(
         "total_combined_savings": round(total_combined, 0),
         "roi_pct": round(roi, 0),
         "num_leaks": len(leak_stats),
-        "avg_duration_days": round(sum(l["duration_days"] for l in leak_stats) / max(len(leak_stats), 1), 0),
+        "avg_duration_days": round(sum(leaks.duration_days) / max(len(leak_stats), 1), 0),
         "per_leak": leak_stats,
         "cumulative_timeline": timeline,
     }
+
+
+@router.get("/compute", response_model=SavingsResult)
+async def compute_savings(
+    water_cost: float = Query(2.50, ge=0.5, le=20.0),
+    repair_cost: float = Query(8500, ge=1000, le=100000),
+    detection_speedup: int = Query(7, ge=1, le=30),
+):
+    """Compute economic savings from early leak detection."""
+    return _compute_savings(water_cost, repair_cost, detection_speedup)
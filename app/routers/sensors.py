@@ -1,13 +1,112 @@
 """Sensor data API endpoints."""
 
 from fastapi import APIRouter, Query
-import pandas as pd
+from numba import njit
+import numpy as np
 
-from ..services.data_service import get_pressures
+from ..services.data_service import get_pressures, get_pressures_np
 from ..services.pipeline_service import run_pipeline
+from ..schemas import TimeSeriesResult
 
 router = APIRouter(prefix="/api/sensors", tags=["sensors"])
 
+MAX_POINTS = 5000
+_MINMAX_RATIO = 4
+
+
+@njit(cache=True)
+def _minmax_lttb_1d(x, y, n_out, minmax_ratio):
+    """
+    Indices of `n_out` points of (x, y) chosen by MinMaxLTTB: the argmin/argmax of
+    each of n_out * minmax_ratio / 2 equal buckets are preselected, then
+    Largest-Triangle-Three-Buckets picks the final points among them. The first
+    and last points are always kept.
+    """
+    n = len(y)
+    n_buckets = n_out * minmax_ratio // 2
+    if n - 2 > 2 * n_buckets:
+        cand = np.empty(2 * n_buckets + 2, dtype=np.int64)
+        cand[0] = 0
+        size = (n - 2) / n_buckets
+        for b in range(n_buckets):
+            lo = int(b * size) + 1
+            hi = int((b + 1) * size) + 1
+            i_min = lo
+            i_max = lo
+            for i in range(lo + 1, hi):
+                if y[i] < y[i_min]:
+                    i_min = i
+                if y[i] > y[i_max]:
+                    i_max = i
+            cand[2 * b + 1] = min(i_min, i_max)
+            cand[2 * b + 2] = max(i_min, i_max)
+        cand[-1] = n - 1
+    else:
+        cand = np.arange(n)
+
+    m = len(cand)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = cand[0]
+    out[-1] = cand[m - 1]
+    every = (m - 2) / (n_out - 2)
+    a = 0
+    for b in range(n_out - 2):
+        lo = int(b * every) + 1
+        hi = int((b + 1) * every) + 1
+        next_hi = min(int((b + 2) * every) + 1, m)
+        avg_x = 0.0
+        avg_y = 0.0
+        for i in range(hi, next_hi):
+            avg_x += x[cand[i]]
+            avg_y += y[cand[i]]
+        avg_x /= next_hi - hi
+        avg_y /= next_hi - hi
+
+        ax = x[cand[a]]
+        ay = y[cand[a]]
+        best = lo
+        best_area = -1.0
+        for i in range(lo, hi):
+            area = abs((ax - avg_x) * (y[cand[i]] - ay) - (ax - x[cand[i]]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = i
+        out[b + 1] = cand[best]
+        a = best
+    return out
+
+
+@njit(cache=True)
+def _minmax_lttb(x, y, n_out, minmax_ratio):
+    """_minmax_lttb_1d for every column of y (T, K); returns (K, n_out)."""
+    K = y.shape[1]
+    out = np.empty((K, n_out), dtype=np.int64)
+    for k in range(K):
+        out[k] = _minmax_lttb_1d(x, np.ascontiguousarray(y[:, k]), n_out, minmax_ratio)
+    return out
+
+
+def _row_slice(times, start_date: str | None, end_date: str | None) -> slice:
+    """
+    Positional row range for the inclusive [start_date, end_date] label range on
+    the sorted timestamp index, by binary search on its datetime64 values. A
+    bound given at a coarser resolution covers its whole period, as with .loc
+    partial-string slicing ("2019-03-02" as end date includes that entire day).
+    """
+    values = times.values
+    try:
+        i0 = np.searchsorted(values, np.datetime64(start_date)) if start_date else 0
+        if end_date:
+            end = np.datetime64(end_date)
+            end += np.timedelta64(1, np.datetime_data(end.dtype)[0])
+            i1 = np.searchsorted(values, end)
+        else:
+            i1 = len(values)
+    except ValueError:
+        # Not ISO 8601; let pandas parse it
+        return times.slice_indexer(start_date, end_date)
+    return slice(i0, i1)
+
 
 @router.get("")
 async def list_sensors():
@@ -16,38 +115,50 @@ async def list_sensors():
     return {"sensor_ids": p.columns.tolist()}
 
 
-@router.get("/timeseries")
+@router.get("/timeseries", response_model=TimeSeriesResult)
 async def get_timeseries(
     sensors: str = Query(..., description="Comma-separated sensor IDs"),
     start_date: str = Query(None),
     end_date: str = Query(None),
 ):
     """Return pressure time-series for selected sensors within a date range."""
-    p = get_pressures()
+    arr, col_idx, times = get_pressures_np()
     sensor_list = [s.strip() for s in sensors.split(",")]
 
     # Validate sensors exist
-    valid = [s for s in sensor_list if s in p.columns]
+    valid = [s for s in sensor_list if s in col_idx]
     if not valid:
         return {"data": [], "sensors": []}
 
-    filtered = p[valid]
-    if start_date:
-        filtered = filtered.loc[start_date:]
-    if end_date:
-        filtered = filtered.loc[:end_date]
-
-    # Downsample for large ranges (keep every Nth point for performance)
-    if len(filtered) > 5000:
-        step = len(filtered) // 5000
-        filtered = filtered.iloc[::step]
-
-    data = []
-    for ts, row in filtered.iterrows():
-        point = {"timestamp": str(ts)}
-        for s in valid:
-            point[s] = round(float(row[s]), 4) if pd.notna(row[s]) else None
-        data.append(point)
+    rows = _row_slice(times, start_date, end_date)
+    times = times[rows]
+    values = arr[rows, [col_idx[s] for s in valid]]
+
+    # Downsample large ranges with MinMaxLTTB so leak spikes and dips survive.
+    # Each sensor gets an equal share of the point budget and the rows picked
+    # for any sensor are kept, so all series stay on one shared timeline.
+    if len(times) > MAX_POINTS:
+        _, first = np.unique(valid, return_index=True)
+        n_out = max(MAX_POINTS // len(first), 3)
+        x = (times.asi8 - times.asi8[0]).astype(np.float64)
+        picked = _minmax_lttb(x, values[:, np.sort(first)], n_out, _MINMAX_RATIO)
+        keep = np.unique(picked)
+        times = times[keep]
+        values = values[keep]
+
+    # Build the JSON rows column-wise: round in one vectorized pass and only go
+    # through an object array (NaN -> None) when the window has gaps
+    timestamps = times.astype(str).tolist()
+    rounded = np.round(values, 4)
+    nan = np.isnan(values)
+    if nan.any():
+        rounded = rounded.astype(object)
+        rounded[nan] = None
+    columns = [rounded[:, j].tolist() for j in range(len(valid))]
+    data = [
+        {"timestamp": ts, **dict(zip(valid, row))}
+        for ts, row in zip(timestamps, zip(*columns))
+    ]
 
     return {"data": data, "sensors": valid}
 
@@ -59,25 +170,27 @@ async def get_stats(
     end_date: str = Query(None),
 ):
     """Return statistics (mean, std, min, max) for selected sensors."""
-    p = get_pressures()
+    arr, col_idx, times = get_pressures_np()
     sensor_list = [s.strip() for s in sensors.split(",")]
-    valid = [s for s in sensor_list if s in p.columns]
+    valid = [s for s in sensor_list if s in col_idx]
+
+    arr = arr[_row_slice(times, start_date, end_date), [col_idx[s] for s in valid]]
 
-    filtered = p[valid]
-    if start_date:
-        filtered = filtered.loc[start_date:]
-    if end_date:
-        filtered = filtered.loc[:end_date]
+    # Only the four reductions we report; describe() would also sort every
+    # column for its quartiles
+    mean = np.nanmean(arr, axis=0)
+    std = np.nanstd(arr, axis=0, ddof=1)
+    mn = np.nanmin(arr, axis=0)
+    mx = np.nanmax(arr, axis=0)
 
     stats = []
-    desc = filtered.describe().T
-    for sensor_id in valid:
+    for j, sensor_id in enumerate(valid):
         stats.append({
             "sensor_id": sensor_id,
-            "mean": round(float(desc.loc[sensor_id, "mean"]), 2),
-            "std": round(float(desc.loc[sensor_id, "std"]), 2),
-            "min": round(float(desc.loc[sensor_id, "min"]), 2),
-            "max": round(float(desc.loc[sensor_id, "max"]), 2),
+            "mean": round(float(mean[j]), 2),
+            "std": round(float(std[j]), 2),
+            "min": round(float(mn[j]), 2),
+            "max": round(float(mx[j]), 2),
         })
 
     return {"stats": stats}
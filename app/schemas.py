@@ -38,6 +38,12 @@ class TimeSeriesPoint(BaseModel):
     values: dict[str, float]
 
 
+class TimeSeriesResult(BaseModel):
+    # One {"timestamp": ..., <sensor_id>: value, ...} row per sample
+    data: list[dict]
+    sensors: list[str]
+
+
 class SensorStats(BaseModel):
     sensor_id: str
     mean: float
@@ -71,3 +77,8 @@ class SandboxSimResult(BaseModel):
     mean_error: float
     max_error: float
     accuracy_pct: float
+
+
+class ReportResult(BaseModel):
+    report: str
+    cached: bool = False
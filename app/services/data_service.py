@@ -3,8 +3,11 @@ Data service — loads and caches SCADA sensor data and ground truth.
 """
 
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+from ..core.detect_leaks import read_scada_csv
+
 # Project root is 2 levels up from app/services/
 _ROOT = Path(__file__).resolve().parents[2]
 _DATA_DIR = _ROOT / 'data'
@@ -12,45 +15,61 @@ _SCADA_DIR = _DATA_DIR / 'SCADA_data' / '2019'
 _GT_FILE = _DATA_DIR / 'leak_ground_truth' / '2019_Leakages.csv'
 
 _pressures: pd.DataFrame | None = None
+_pressure_arrays: tuple[np.ndarray, dict[str, int], pd.DatetimeIndex] | None = None
 _flows: pd.DataFrame | None = None
 _ground_truth_raw: pd.DataFrame | None = None
+_ground_truth_arrays: tuple[np.ndarray, list[str], pd.DatetimeIndex] | None = None
+_active_leak_pipes: list[str] | None = None
 
 
 def get_pressures() -> pd.DataFrame:
     global _pressures
     if _pressures is None:
-        p = pd.read_csv(
-            _SCADA_DIR / 'Pressures.csv',
-            dayfirst=True, sep=';', decimal=','
-        )
-        p.index = pd.to_datetime(p['Timestamp'])
-        _pressures = p.drop('Timestamp', axis=1)
+        _pressures = read_scada_csv(_SCADA_DIR / 'Pressures.csv')
     return _pressures
 
 
+def get_pressures_np() -> tuple[np.ndarray, dict[str, int], pd.DatetimeIndex]:
+    """
+    (values, sensor id -> column position, timestamps) for the pressure frame,
+    so per-request sensor subsets can be gathered positionally from one array.
+    """
+    global _pressure_arrays
+    if _pressure_arrays is None:
+        p = get_pressures()
+        col_idx = {c: i for i, c in enumerate(p.columns)}
+        _pressure_arrays = (p.to_numpy(dtype=np.float64), col_idx, p.index)
+    return _pressure_arrays
+
+
 def get_flows() -> pd.DataFrame:
     global _flows
     if _flows is None:
-        f = pd.read_csv(
-            _SCADA_DIR / 'Flows.csv',
-            dayfirst=True, sep=';', decimal=','
-        )
-        f.index = pd.to_datetime(f['Timestamp'])
-        _flows = f.drop('Timestamp', axis=1)
+        _flows = read_scada_csv(_SCADA_DIR / 'Flows.csv')
     return _flows
 
 
 def get_ground_truth_raw() -> pd.DataFrame:
     global _ground_truth_raw
     if _ground_truth_raw is None:
-        gt = pd.read_csv(_GT_FILE, sep=';', decimal=',').fillna(0)
-        gt['Timestamp'] = pd.to_datetime(gt['Timestamp'])
-        _ground_truth_raw = gt
+        # Same ';'/',' export format as the SCADA files, so it shares their parser and cache
+        _ground_truth_raw = read_scada_csv(_GT_FILE).fillna(0).reset_index()
     return _ground_truth_raw
 
 
+def get_ground_truth_np() -> tuple[np.ndarray, list[str], pd.DatetimeIndex]:
+    """(leak flows (T, n_pipes), pipe ids, timestamps) for the ground truth, built once."""
+    global _ground_truth_arrays
+    if _ground_truth_arrays is None:
+        gt_ts = get_ground_truth_raw().set_index('Timestamp')
+        _ground_truth_arrays = (gt_ts.to_numpy(dtype=np.float64), gt_ts.columns.tolist(), gt_ts.index)
+    return _ground_truth_arrays
+
+
 def get_active_leak_pipes() -> list[str]:
-    gt = get_ground_truth_raw()
-    gt_ts = gt.set_index('Timestamp')
-    active = gt_ts.max()
-    return active[active > 0].index.tolist()
+    global _active_leak_pipes
+    if _active_leak_pipes is None:
+        arr, pipes, _ = get_ground_truth_np()
+        peak = arr.max(axis=0)
+        _active_leak_pipes = [pipe for pipe, m in zip(pipes, peak) if m > 0]
+    return list(_active_leak_pipes)
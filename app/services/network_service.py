@@ -3,45 +3,44 @@ Network service — loads and caches the EPANET water network model.
 """
 
 from pathlib import Path
-import numpy as np
-import wntr
+
+from ..core.detect_leaks import load_water_network, node_coordinates, link_endpoints
 
 _ROOT = Path(__file__).resolve().parents[2]
 _EPANET_FILE = _ROOT / 'data' / 'L-TOWN.inp'
 
-_network = None
-
 
 def get_network():
-    global _network
-    if _network is None:
-        _network = wntr.network.WaterNetworkModel(str(_EPANET_FILE))
-    return _network
+    """The L-Town model, shared with the pipeline and re-parsed when the .inp changes. Read-only."""
+    return load_water_network(_EPANET_FILE)
 
 
 def get_network_data() -> dict:
     wn = get_network()
-    nodes = [{"id": n, "x": float(nd.coordinates[0]), "y": float(nd.coordinates[1])} for n, nd in wn.nodes()]
-    links = []
-    for name, link in wn.links():
-        sc = wn.get_node(link.start_node_name).coordinates
-        ec = wn.get_node(link.end_node_name).coordinates
-        links.append({
-            "id": name, "start_node": link.start_node_name, "end_node": link.end_node_name,
-            "start_x": float(sc[0]), "start_y": float(sc[1]),
-            "end_x": float(ec[0]), "end_y": float(ec[1]),
-        })
+    # Coordinates and link end rows come from the per-model arrays detect_leaks caches
+    node_row, node_xy = node_coordinates(wn)
+    link_row, link_ends = link_endpoints(wn)
+    node_ids = list(node_row)
+    nodes = [{"id": n, "x": x, "y": y} for n, (x, y) in zip(node_ids, node_xy.tolist())]
+    links = [
+        {
+            "id": name, "start_node": node_ids[s], "end_node": node_ids[e],
+            "start_x": sx, "start_y": sy,
+            "end_x": ex, "end_y": ey,
+        }
+        for name, (s, e), (sx, sy), (ex, ey) in zip(
+            link_row, link_ends.tolist(),
+            node_xy[link_ends[:, 0]].tolist(), node_xy[link_ends[:, 1]].tolist(),
+        )
+    ]
     return {"nodes": nodes, "links": links, "num_nodes": wn.num_nodes, "num_links": wn.num_links}
 
 
 def get_ground_truth_coords(active_pipes: list[str]) -> list[dict]:
     wn = get_network()
-    coords = []
-    for pipe_id in active_pipes:
-        if pipe_id in wn.link_name_list:
-            link = wn.get_link(pipe_id)
-            sc = np.array(wn.get_node(link.start_node_name).coordinates)
-            ec = np.array(wn.get_node(link.end_node_name).coordinates)
-            mid = (sc + ec) / 2
-            coords.append({"pipe_id": pipe_id, "x": float(mid[0]), "y": float(mid[1])})
-    return coords
+    node_xy = node_coordinates(wn)[1]
+    link_row, link_ends = link_endpoints(wn)
+    pipes = [pipe_id for pipe_id in active_pipes if pipe_id in link_row]
+    ends = link_ends[[link_row[pipe_id] for pipe_id in pipes]].reshape(-1, 2)
+    mid = ((node_xy[ends[:, 0]] + node_xy[ends[:, 1]]) / 2).tolist()
+    return [{"pipe_id": pipe_id, "x": x, "y": y} for pipe_id, (x, y) in zip(pipes, mid)]
@@ -3,11 +3,11 @@ Pipeline service — wraps the LILA detection pipeline and caches results.
 """
 
 from pathlib import Path
+import hashlib
 import json
 import numpy as np
-import wntr
 
-from ..core.detect_leaks import LILA_Pipeline, evaluate_accuracy
+from ..core.detect_leaks import LILA_Pipeline, evaluate_accuracy, load_water_network
 
 _ROOT = Path(__file__).resolve().parents[2]
 _DATA_DIR = _ROOT / 'data'
@@ -15,26 +15,42 @@ _SCADA_DIR = _DATA_DIR / 'SCADA_data' / '2019'
 _EPANET_FILE = _DATA_DIR / 'L-TOWN.inp'
 _GT_FILE = _DATA_DIR / 'leak_ground_truth' / '2019_Leakages.csv'
 _CACHE_FILE = _ROOT / '.pipeline_cache.json'
+# Files the LILA pipeline reads; the disk cache is only reused for the same contents
+_INPUT_FILES = (_SCADA_DIR / 'Pressures.csv', _SCADA_DIR / 'Flows.csv', _EPANET_FILE)
 
 _results: list[dict] | None = None
 _pipeline = None
 _detector = None
 _df_cs = None
 _detected_leaks = None
+_metrics: dict | None = None
+
+
+def _input_key() -> str:
+    h = hashlib.sha256()
+    for path in _INPUT_FILES:
+        with open(path, 'rb') as f:
+            h.update(hashlib.file_digest(f, 'sha256').digest())
+    return h.hexdigest()[:16]
 
 
 def run_pipeline() -> list[dict]:
-    global _results, _pipeline, _detector, _df_cs, _detected_leaks
+    global _results, _pipeline, _detector, _df_cs, _detected_leaks, _metrics
     if _results is not None:
         return _results
+    _metrics = None
 
     # Try loading from disk cache first (instant startup)
+    key = _input_key()
     if _CACHE_FILE.exists():
         try:
             with open(_CACHE_FILE, 'r') as f:
-                _results = json.load(f)
-            print(f"Loaded {len(_results)} cached pipeline results from {_CACHE_FILE.name}")
-            return _results
+                cached = json.load(f)
+            if isinstance(cached, dict) and cached.get("key") == key:
+                _results = cached["results"]
+                print(f"Loaded {len(_results)} cached pipeline results from {_CACHE_FILE.name}")
+                return _results
+            print(f"{_CACHE_FILE.name} was computed from different input data, running full pipeline...")
         except Exception as e:
             print(f"Cache load failed ({e}), running full pipeline...")
 
@@ -46,7 +62,9 @@ def run_pipeline() -> list[dict]:
     _df_cs = computed_df_cs
     _detected_leaks = detected_leaks
 
-    wn = wntr.network.WaterNetworkModel(str(_EPANET_FILE))
+    wn = load_water_network(_EPANET_FILE)
+    if not fault_matrix:
+        detector.precompute_gnn_errors(detected_leaks.values(), detector.pressures)
     results_list = []
     for node, ts in detected_leaks.items():
         if fault_matrix:
@@ -97,7 +115,7 @@ def run_pipeline() -> list[dict]:
     # Save to disk cache for instant startup next time
     try:
         with open(_CACHE_FILE, 'w') as f:
-            json.dump(_results, f)
+            json.dump({"key": key, "results": _results}, f)
         print(f"Cached {len(_results)} pipeline results to {_CACHE_FILE.name}")
     except Exception as e:
         print(f"Warning: Could not cache results ({e})")
@@ -106,8 +124,16 @@ def run_pipeline() -> list[dict]:
 
 
 def get_metrics() -> dict:
+    global _metrics
     results = run_pipeline()
-    
+    # Metrics only change when run_pipeline produces new results
+    if _metrics is not None:
+        return _metrics
+    _metrics = _compute_metrics(results)
+    return _metrics
+
+
+def _compute_metrics(results: list[dict]) -> dict:
     # If loaded from cache, pipeline internals aren't available — return defaults
     if _detected_leaks is None or _pipeline is None:
         return {
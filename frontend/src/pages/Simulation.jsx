@@ -10,7 +10,7 @@ import { Activity, Database, BrainCircuit, BarChart3, AlertTriangle, Fingerprint
 const STEPS = [
     { icon: <Database className="w-3.5 h-3.5" />, label: 'Data Ingestion' },
     { icon: <BrainCircuit className="w-3.5 h-3.5" />, label: 'GNN Training' },
-    { icon: <BarChart3 className="w-3.5 h-3.5" />, label: 'RF Regression' },
+    { icon: <BarChart3 className="w-3.5 h-3.5" />, label: 'GBR Regression' },
     { icon: <AlertTriangle className="w-3.5 h-3.5" />, label: 'CUSUM Detection' },
     { icon: <Fingerprint className="w-3.5 h-3.5" />, label: 'Entropy Features' },
     { icon: <Crosshair className="w-3.5 h-3.5" />, label: 'Localization' },
@@ -91,9 +91,9 @@ export default function Simulation() {
 
                 {step === 2 && (
                     <>
-                        <SectionHeader>Step 3: Random Forest Regression Residuals</SectionHeader>
+                        <SectionHeader>Step 3: Gradient Boosting Regression Residuals</SectionHeader>
                         <p className="text-sm text-[var(--color-text-dim)] mb-4">
-                            For each sensor node, a <strong>Random Forest Regressor</strong> (100 trees, max depth 5) is trained on the calibration window
+                            For each sensor node, a <strong>Histogram Gradient Boosting Regressor</strong> (100 iterations, max depth 5) is trained on the calibration window
                             using 3 reference nodes. Each model uses 3 features: reference pressure <code className="text-[var(--color-accent)]">P_j</code>,
                             source flow <code className="text-[var(--color-accent)]">V</code> (PUMP_1), and an <strong>engineered flow-to-pressure ratio</strong>:
                         </p>
@@ -243,7 +243,7 @@ export default function Simulation() {
                     </p>
                     <ul className="text-xs text-[var(--color-text-dimmer)] space-y-1 mb-3 pl-4 list-disc">
                         <li>GATv2 graph autoencoder for topology-aware anomaly detection</li>
-                        <li>Random Forest regression with engineered flow-to-pressure features</li>
+                        <li>Gradient boosting regression with engineered flow-to-pressure features</li>
                         <li>Entropy-weighted triangulation (Fourier + Permutation entropy)</li>
                         <li>Physics-based fault matrix matching via EPANET simulation</li>
                         <li>Full-stack real-time dashboard, sandbox, and voice dispatch</li>